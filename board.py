@@ -57,6 +57,14 @@ class Board:
     def get_board(self):
         return self
 
+    @staticmethod
+    def window_size(rows, cols, xinset=50, yinset=50, size=50):
+        """
+        Returns the (width, height) of a window that fits a board with
+        the given grid, leaving room for the text areas and buttons.
+        """
+        return xinset + size * cols + 150, yinset + size * rows + 150
+
     def get_grid_cell(self, row, col):
         if row < 0 or row >= self._rows or col < 0 or col >= self._cols :
             return None
@@ -67,19 +75,21 @@ class Board:
         Update the graphical representation on a single grid cell
         """
         cell = self._grid[row][col]
-        cell.setText(text)
-        cell.setTextColor(text_color)
-        cell.setFillColor(fill_color)
+        with self._win.batch():
+            cell.setText(text)
+            cell.setTextColor(text_color)
+            cell.setFillColor(fill_color)
 
     def reset_grid_graphics(self) :
         """
         Resets the text color and fill color of all cells to their
-        default values.
+        default values, redrawing the window once.
         """
-        for row in range(self._rows):
-            for col in range(self._cols):
-                self._grid[row][col].setTextColor("black")
-                self._grid[row][col].setFillColor("white")
+        with self._win.batch():
+            for row in range(self._rows):
+                for col in range(self._cols):
+                    self._grid[row][col].setTextColor("black")
+                    self._grid[row][col].setFillColor("white")
 
     def __make_text_area(self, point, fontsize=18, color="black", text=""):
         """Creates a text area"""
@@ -98,13 +108,22 @@ class Board:
         
         return TextRect(rect, text)
 
+    def __grid_right(self):
+        """x coordinate of the right edge of the grid"""
+        return self._xinset + self._size * self._cols
+
+    def __grid_bottom(self):
+        """y coordinate of the bottom edge of the grid"""
+        return self._yinset + self._size * self._rows
+
     def __make_text_areas(self):
-        self._text_area = self.__make_text_area(Point(self._xinset * self._rows + self._size * 2,
+        center_x = self._xinset + self._size * self._cols // 2 + 10
+        self._text_area = self.__make_text_area(Point(self.__grid_right() + 50,
                                                    self._yinset + 50), 14)
         #draw the text area below grid
-        self._lower_word = self.__make_text_area(Point(160, 275))
+        self._lower_word = self.__make_text_area(Point(center_x, self.__grid_bottom() + 25))
         #draw the text area above grid
-        self._upper_word = self.__make_text_area(Point(160, 25), color="red")
+        self._upper_word = self.__make_text_area(Point(center_x, self._yinset // 2), color="red")
         
     def __make_grid(self):
         """Creates a row x col grid, filled with empty squares"""
@@ -122,9 +141,10 @@ class Board:
 
     def __make_buttons(self):
         """Create reset and exit buttons"""
-        p1 = Point(50, 300); p2 = Point(130, 350)
+        top = self.__grid_bottom() + 50; bottom = top + 50
+        p1 = Point(50, top); p2 = Point(130, bottom)
         self._reset_button = self._make_textrect(p1, p2, text="RESET")
-        p3 = Point(170, 300); p4 = Point(250, 350)
+        p3 = Point(170, top); p4 = Point(250, bottom)
         self._exit_button = self._make_textrect(p3, p4, text="EXIT")        
 
     def make_board(self):
@@ -201,8 +221,8 @@ class Board:
         '''
         pt_x = point.getX()
         pt_y = point.getY()
-        max_y = self._size * (self._rows + 1)
-        max_x = self._size * (self._cols + 1)
+        max_y = self.__grid_bottom()
+        max_x = self.__grid_right()
         return pt_x <= max_x and pt_y <= max_y and pt_x >= self._xinset and pt_y >= self._yinset
 
     # clicked in exit button?
@@ -0,0 +1,121 @@
+"""
+Searches for high-scoring Boggle boards by simulated annealing.
+
+A candidate board is an arrangement of the dice (which cube sits on
+which cell) together with the face each cube shows.  Each step either
+swaps two cubes or turns one cube to another of its faces, and the new
+score comes from an IncrementalSolver, which only re-solves the words
+around the changed cells.  Worse boards are accepted with probability
+exp(delta / temperature), and the temperature falls geometrically over
+the time budget.
+
+Usage:
+    python boggleanneal.py [-t SECONDS] [--seed SEED] [--dice SET]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from bogglesolver import IncrementalSolver
+from dice import CUBE_FACES, DEFAULT_DICE, get_dice
+from lexicon import get_lexicon
+
+
+def _faces(dice, layout):
+    """Returns the visible faces of a layout of (cube, face index) pairs."""
+    return [ dice[cube][face] for cube, face in layout ]
+
+
+def anneal(dice=CUBE_FACES, rows=4, cols=4, time_budget=10.0, seed=None,
+           lexicon=None, start_temperature=8.0, end_temperature=0.2,
+           report=None, report_interval=1.0):
+    """
+    Anneals a rows x cols board built from dice for time_budget seconds.
+    Returns (best score, best layout), where the layout lists a
+    (cube number, face index) pair for each cell in row-major order.
+    If report is given, it is called about every report_interval seconds
+    as report(elapsed seconds, best score, current score, steps per second).
+    """
+    if len(dice) != rows * cols:
+        raise ValueError("expected {} dice, got {}".format(rows * cols, len(dice)))
+    if lexicon is None:
+        lexicon = get_lexicon()
+    rng = random.Random(seed)
+    cells = rows * cols
+
+    cubes = list(range(cells))
+    rng.shuffle(cubes)
+    layout = [ (cube, rng.randrange(len(dice[cube]))) for cube in cubes ]
+    solver = IncrementalSolver(_faces(dice, layout), rows, cols, lexicon)
+    score = solver.get_score()
+    best_score, best_layout = score, list(layout)
+
+    start = time.perf_counter()
+    next_report = start + report_interval
+    cooling = math.log(end_temperature / start_temperature)
+    steps = 0
+    while True:
+        now = time.perf_counter()
+        elapsed = now - start
+        if elapsed >= time_budget:
+            break
+        if report is not None and now >= next_report:
+            report(elapsed, best_score, score, steps / elapsed)
+            next_report += report_interval
+        temperature = start_temperature * math.exp(cooling * elapsed / time_budget)
+
+        # check the clock only every so often; steps are cheap
+        for i in range(64):
+            steps += 1
+            if rng.random() < 0.5:
+                cell1, cell2 = rng.sample(range(cells), 2)
+                added, removed, delta = solver.swap(cell1, cell2)
+                if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                    layout[cell1], layout[cell2] = layout[cell2], layout[cell1]
+                else:
+                    solver.swap(cell1, cell2)
+                    continue
+            else:
+                cell = rng.randrange(cells)
+                cube, old_face = layout[cell]
+                face = rng.randrange(len(dice[cube]))
+                added, removed, delta = solver.set_face(cell, dice[cube][face])
+                if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                    layout[cell] = (cube, face)
+                else:
+                    solver.set_face(cell, dice[cube][old_face])
+                    continue
+            score += delta
+            if score > best_score:
+                best_score, best_layout = score, list(layout)
+
+    if report is not None:
+        elapsed = time.perf_counter() - start
+        report(elapsed, best_score, score, steps / elapsed if elapsed else 0)
+    return best_score, best_layout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a high-scoring Boggle board.")
+    parser.add_argument("-t", "--time", type=float, default=10.0, help="time budget in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dice", default=DEFAULT_DICE, help="dice set from dice.py")
+    args = parser.parse_args(argv)
+    rows, cols, dice = get_dice(args.dice)
+
+    def report(elapsed, best, current, rate):
+        print("{:6.1f}s  best {:4d}  current {:4d}  {:6.0f} steps/s".format(
+            elapsed, best, current, rate))
+
+    score, layout = anneal(dice, rows, cols, time_budget=args.time, seed=args.seed,
+                           report=report)
+    faces = _faces(dice, layout)
+    print("best score {}:".format(score))
+    for row in range(rows):
+        print(" ".join("{:2}".format(face) for face in faces[row * cols:row * cols + cols]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Solves large numbers of Boggle boards across all CPU cores.
+
+Boards are read from a stream, grouped into chunks and fanned out to a
+ProcessPoolExecutor.  Each worker process loads the lexicon once, by
+path, through lexicon.get_lexicon; the compiled lexicon is memory-mapped,
+so all workers share the same pages and nothing but the boards and their
+results is pickled.  Each worker builds the solver's dense child table
+from it once.  Results come back in input order.
+
+Usage:
+    python bogglebatch.py [-w WORKERS] [-c CHUNKSIZE] [--rows R] [--cols C]
+                          [--words] [FILE]
+
+Each input line is one board in row-major order, either as faces
+separated by spaces or commas ("A B QU E ...") or as a run of letters
+("ABQUE...").  A "Q" on its own also stands for the "QU" face.  Lines
+with unknown faces or the wrong number of faces are reported on stderr,
+with their line number, and skipped.  Each output line is the board,
+its word count and its score, separated by tabs.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import bogglesolver
+from lexicon import DEFAULT_LEXICON, get_lexicon
+
+# _worker_state: (lexicon, rows, cols) for the current worker process
+_worker_state = None
+
+# _RUN_FACE: one face of a run of letters; "QU" is a single face
+_RUN_FACE = re.compile("QU?|.")
+
+
+def parse_board(line, cells=None):
+    """
+    Parses one input line into a list of faces.  Raises ValueError for
+    an unknown face, or if cells is given and the line does not have
+    exactly that many faces.
+    >>> parse_board("ABQUQ")
+    ['A', 'B', 'QU', 'QU']
+    >>> parse_board("a, b, qu, d")
+    ['A', 'B', 'QU', 'D']
+    >>> parse_board("AB3D")
+    Traceback (most recent call last):
+    ...
+    ValueError: unknown cube face '3'
+    >>> parse_board("ABCD", cells=16)
+    Traceback (most recent call last):
+    ...
+    ValueError: expected 16 faces, got 4
+    """
+    line = line.strip().upper()
+    if " " in line or "," in line:
+        faces = line.replace(",", " ").split()
+    else:
+        faces = _RUN_FACE.findall(line)
+    faces = [ "QU" if face == "Q" else face for face in faces ]
+    bogglesolver.face_symbols(faces)
+    if cells is not None and len(faces) != cells:
+        raise ValueError("expected {} faces, got {}".format(cells, len(faces)))
+    return faces
+
+
+def format_board(faces):
+    """
+    Formats a list of faces the way parse_board reads them.
+    >>> format_board(['A', 'B', 'QU', 'D'])
+    'ABQUD'
+    >>> parse_board(format_board(['QU', 'U']))
+    ['QU', 'U']
+    """
+    return "".join(faces)
+
+
+def _init_worker(lexicon_path, rows, cols):
+    """Loads the shared lexicon once per worker process."""
+    global _worker_state
+    _worker_state = (get_lexicon(lexicon_path), rows, cols)
+
+
+def _solve_chunk(boards):
+    """
+    Solves a chunk of boards in a worker.  Returns (worker pid, seconds
+    spent, [(sorted words, score), ...]).
+    """
+    lexicon, rows, cols = _worker_state
+    start = time.perf_counter()
+    results = []
+    for faces in boards:
+        words = sorted(bogglesolver.solve(faces, rows, cols, lexicon))
+        results.append((words, bogglesolver.total_score(words)))
+    return os.getpid(), time.perf_counter() - start, results
+
+
+def _chunks(boards, chunksize):
+    """Groups an iterable of boards into lists of at most chunksize."""
+    chunk = []
+    for faces in boards:
+        chunk.append(faces)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _record(stats, pid, seconds, boards):
+    """Adds one finished chunk to the per-worker stats."""
+    if stats is not None:
+        entry = stats.setdefault(pid, { "boards": 0, "seconds": 0.0 })
+        entry["boards"] += boards
+        entry["seconds"] += seconds
+
+
+def solve_boards(boards, rows=4, cols=4, lexicon_path=DEFAULT_LEXICON,
+                 workers=None, chunksize=256, stats=None):
+    """
+    Solves every board (a list of faces in row-major order) from the
+    iterable boards and yields (sorted words, score) for each, in input
+    order.  Boards are consumed lazily, so boards may be an unbounded
+    stream.  workers is the number of worker processes (default: one
+    per CPU); 0 solves in the calling process.  If stats is a dict it is
+    filled in with {pid: {"boards": n, "seconds": t}} for every worker.
+    """
+    if workers == 0:
+        _init_worker(lexicon_path, rows, cols)
+        for chunk in _chunks(boards, chunksize):
+            pid, seconds, results = _solve_chunk(chunk)
+            _record(stats, pid, seconds, len(results))
+            yield from results
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(lexicon_path, rows, cols)) as executor:
+        # keep a bounded number of chunks in flight so input is streamed
+        pending = deque()
+        for chunk in _chunks(boards, chunksize):
+            pending.append(executor.submit(_solve_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                pid, seconds, results = pending.popleft().result()
+                _record(stats, pid, seconds, len(results))
+                yield from results
+        while pending:
+            pid, seconds, results = pending.popleft().result()
+            _record(stats, pid, seconds, len(results))
+            yield from results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many Boggle boards in parallel.")
+    parser.add_argument("file", nargs="?", help="file of boards, one per line (default: stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU, 0: no pool)")
+    parser.add_argument("-c", "--chunksize", type=int, default=256,
+                        help="boards sent to a worker at a time")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--lexicon", default=DEFAULT_LEXICON)
+    parser.add_argument("--words", action="store_true", help="also print the words found")
+    args = parser.parse_args(argv)
+
+    source = open(args.file) if args.file else sys.stdin
+    # boards read but not yet printed, in input order
+    boards = deque()
+    stats = {}
+
+    def read_boards():
+        for number, line in enumerate(source, 1):
+            if line.strip():
+                try:
+                    faces = parse_board(line, args.rows * args.cols)
+                except ValueError as e:
+                    print("line {}: {}".format(number, e), file=sys.stderr)
+                    continue
+                boards.append(faces)
+                yield faces
+
+    start = time.perf_counter()
+    count = 0
+    for words, score in solve_boards(read_boards(), args.rows, args.cols, args.lexicon,
+                                     args.workers, args.chunksize, stats):
+        faces = boards.popleft()
+        count += 1
+        line = "{}\t{}\t{}".format(format_board(faces), len(words), score)
+        if args.words:
+            line += "\t" + " ".join(words)
+        print(line)
+    elapsed = time.perf_counter() - start
+
+    for pid, entry in sorted(stats.items()):
+        print("worker {}: {} boards in {:.2f}s ({:.0f} boards/s)".format(
+            pid, entry["boards"], entry["seconds"],
+            entry["boards"] / entry["seconds"] if entry["seconds"] else 0), file=sys.stderr)
+    print("total: {} boards in {:.2f}s ({:.0f} boards/s)".format(
+        count, elapsed, count / elapsed if elapsed else 0), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
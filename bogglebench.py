@@ -0,0 +1,273 @@
+"""
+Benchmarks for the Boggle solver and board code.
+
+Usage:
+    python bogglebench.py [benchmark ...]
+
+With no arguments every benchmark is run.  Boards are generated from
+CUBE_FACES with a fixed seed so runs are comparable.
+"""
+
+import random
+import sys
+import time
+
+import bogglesolver
+from dice import CUBE_FACES, load_dice_sets
+from lexicon import get_lexicon
+
+
+def random_boards(count, dice=CUBE_FACES, seed=0):
+    """
+    Returns count random layouts (lists of visible faces) for dice.
+    """
+    rng = random.Random(seed)
+    boards = []
+    for i in range(count):
+        cubes = list(dice)
+        rng.shuffle(cubes)
+        boards.append([ rng.choice(faces) for faces in cubes ])
+    return boards
+
+
+def naive_solve(faces, rows, cols, lexicon, min_length=bogglesolver.MIN_WORD_LENGTH):
+    """
+    Reference depth-first solver in the style of the click-driven game:
+    adjacency is checked by comparing coordinates against every cell,
+    the cubes used so far are kept in a list, and the lexicon is queried
+    with strings at every step.
+    """
+    cells = rows * cols
+    found = {}
+
+    def visit(cell, path, word):
+        path = path + [ cell ]
+        word = word + faces[cell]
+        if not lexicon.is_prefix(word):
+            return
+        if len(word) >= min_length and word not in found and lexicon.contains(word):
+            found[word] = [ divmod(c, cols) for c in path ]
+        row, col = divmod(cell, cols)
+        for other in range(cells):
+            r, c = divmod(other, cols)
+            if other not in path and abs(r - row) <= 1 and abs(c - col) <= 1:
+                visit(other, path, word)
+
+    for cell in range(cells):
+        visit(cell, [], "")
+    return found
+
+
+def _time_boards(solve, boards, rows, cols, lexicon):
+    """Returns (boards per second, total words) for solving boards."""
+    start = time.perf_counter()
+    words = 0
+    for faces in boards:
+        words += len(solve(faces, rows, cols, lexicon))
+    return len(boards) / (time.perf_counter() - start), words
+
+
+def bench_solver(count=500):
+    """Compares the bitmask solver with the naive reference solver."""
+    lexicon = get_lexicon()
+    boards = random_boards(count)
+    naive_rate, naive_words = _time_boards(naive_solve, boards[:count // 10], 4, 4, lexicon)
+    rate, words = _time_boards(bogglesolver.solve, boards, 4, 4, lexicon)
+    print("solver: naive DFS   {:8.0f} boards/s".format(naive_rate))
+    print("solver: bitmask DFS {:8.0f} boards/s ({:.1f}x), {:.1f} words/board".format(
+        rate, rate / naive_rate, words / count))
+
+
+def bench_vector(count=4000):
+    """Compares the NumPy batch solver with a per-board loop."""
+    try:
+        import bogglevec
+    except ImportError:
+        print("vector: skipped (NumPy is not installed)")
+        return
+    lexicon = get_lexicon()
+    boards = random_boards(count)
+    loop_rate, words = _time_boards(bogglesolver.solve, boards, 4, 4, lexicon)
+    encoded = bogglevec.encode_boards(boards)
+    bogglevec.solve_boards(encoded[:16], lexicon=lexicon)
+    start = time.perf_counter()
+    counts, scores = bogglevec.solve_boards(encoded, lexicon=lexicon)
+    rate = count / (time.perf_counter() - start)
+    assert counts.sum() == words
+    print("vector: per-board loop {:8.0f} boards/s".format(loop_rate))
+    print("vector: NumPy batches  {:8.0f} boards/s ({:.1f}x)".format(rate, rate / loop_rate))
+
+
+def bench_incremental(count=2000):
+    """Compares incremental re-solves after one-cube edits with full solves."""
+    lexicon = get_lexicon()
+    faces = random_boards(1)[0]
+    rng = random.Random(0)
+    edits = [ (rng.randrange(16), rng.choice(rng.choice(CUBE_FACES))) for i in range(count) ]
+
+    solver = bogglesolver.IncrementalSolver(faces, 4, 4, lexicon)
+    start = time.perf_counter()
+    for cell, face in edits:
+        solver.set_face(cell, face)
+    incremental_rate = count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for cell, face in edits:
+        faces[cell] = face
+        bogglesolver.solve(faces, 4, 4, lexicon)
+    full_rate = count / (time.perf_counter() - start)
+    print("incremental: full re-solve  {:8.0f} edits/s".format(full_rate))
+    print("incremental: local re-solve {:8.0f} edits/s ({:.1f}x)".format(
+        incremental_rate, incremental_rate / full_rate))
+
+
+def bench_gridsize(count=200):
+    """Reports solve time for each configured dice set / grid size."""
+    lexicon = get_lexicon()
+    for name, (rows, cols, dice) in sorted(load_dice_sets().items(), key=lambda s: len(s[1][2])):
+        boards = random_boards(count, dice)
+        start = time.perf_counter()
+        words = 0
+        for faces in boards:
+            words += len(bogglesolver.solve(faces, rows, cols, lexicon))
+        elapsed = time.perf_counter() - start
+        print("gridsize: {:8} {}x{} {:8.3f} ms/board, {:6.1f} words/board".format(
+            name, rows, cols, 1000 * elapsed / count, words / count))
+
+
+def bench_memory(count=20000):
+    """Reports bytes per board for BoggleCube lists and packed boards."""
+    import gc
+    import tracemalloc
+    from packedboard import BoardStore, PackedBoard
+
+    rng = random.Random(0)
+    packed = [ PackedBoard.shaken(rng=rng) for i in range(count) ]
+
+    def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return (after - before) / count, kept
+
+    cube_lists, kept = measure(lambda: [ board.make_cubes() for board in packed ])
+    del kept
+    objects, kept = measure(lambda: [ PackedBoard(board.get_dice(), 4, 4, board.to_bytes())
+                                      for board in packed ])
+    del kept
+
+    def build_store():
+        store = BoardStore()
+        for board in packed:
+            store.append(board)
+        return store
+    stored, kept = measure(build_store)
+    print("memory: list of BoggleCubes {:6.0f} bytes/board".format(cube_lists))
+    print("memory: PackedBoard         {:6.0f} bytes/board".format(objects))
+    print("memory: BoardStore          {:6.0f} bytes/board".format(stored))
+
+
+def bench_generate(count=100000):
+    """Compares bulk NumPy board generation with shaking boards one by one."""
+    try:
+        import bogglegen
+    except ImportError:
+        print("generate: skipped (NumPy is not installed)")
+        return
+    from brandom import random_int, shuffled
+
+    start = time.perf_counter()
+    for i in range(count // 10):
+        cubes = shuffled(list(CUBE_FACES))
+        faces = [ faces[random_int(0, 5)] for faces in cubes ]
+    loop_rate = count // 10 / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bogglegen.shake_boards(count, seed=0)
+    rate = count / (time.perf_counter() - start)
+    print("generate: one board at a time {:10.0f} boards/s".format(loop_rate))
+    print("generate: NumPy batches       {:10.0f} boards/s ({:.0f}x)".format(rate, rate / loop_rate))
+
+
+def bench_encode(count=200000):
+    """Reports board code sizes and encode/decode rates."""
+    import bogglecode
+    from boggleid import board_from_id
+    boards = [ board_from_id(k) for k in range(count // 100) ]
+    start = time.perf_counter()
+    codes = [ bogglecode.to_bytes(board) for board in boards ]
+    encode_rate = len(boards) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for code in codes:
+        bogglecode.from_bytes(code)
+    decode_rate = len(boards) / (time.perf_counter() - start)
+    print("encode: {} bytes/board (PackedBoard: 32)".format(bogglecode.code_bytes()))
+    print("encode: one at a time  {:9.0f} encodes/s {:9.0f} decodes/s".format(encode_rate, decode_rate))
+    try:
+        import bogglegen
+    except ImportError:
+        print("encode: NumPy batches skipped (NumPy is not installed)")
+        return
+    cubes, faces = bogglegen.shake_boards(count, seed=0)
+    start = time.perf_counter()
+    codes = bogglegen.encode_boards(cubes, faces)
+    encode_rate = count / (time.perf_counter() - start)
+    start = time.perf_counter()
+    bogglegen.decode_boards(codes)
+    decode_rate = count / (time.perf_counter() - start)
+    print("encode: NumPy batches  {:9.0f} encodes/s {:9.0f} decodes/s".format(encode_rate, decode_rate))
+
+
+def bench_headless(count=200):
+    """Plays whole games on the headless model, entering every word."""
+    from bogglemodel import BoggleGameModel
+    lexicon = get_lexicon()
+    start = time.perf_counter()
+    words = 0
+    for i in range(count):
+        game = BoggleGameModel(lexicon=lexicon)
+        game.reset_game()
+        for word in game.get_board().solve(lexicon):
+            words += game.enter_word(word)
+    rate = count / (time.perf_counter() - start)
+    print("headless: {:8.0f} games/s, {:.1f} words entered/game".format(rate, words / count))
+
+
+def bench_imports(repeat=5):
+    """Times importing each module in a fresh interpreter."""
+    import subprocess
+    script = ("import sys, time\n"
+              "start = time.perf_counter()\n"
+              "import {}\n"
+              "elapsed = time.perf_counter() - start\n"
+              "graphics = sys.modules.get('graphics')\n"
+              "print(elapsed, graphics is not None and graphics._root is not None)\n")
+    for name in ("bogglesolver", "bogglemodel", "boggleboard", "bogglegame"):
+        times = []
+        for i in range(repeat):
+            result = subprocess.run([ sys.executable, "-c", script.format(name) ],
+                                    capture_output=True, text=True)
+            if result.returncode:
+                print("imports: {:12} failed: {}".format(
+                    name, result.stderr.strip().splitlines()[-1]))
+                break
+            elapsed, tk_created = result.stdout.split()
+            times.append(float(elapsed))
+        else:
+            print("imports: {:12} {:6.1f} ms, Tk root created: {}".format(
+                name, 1000 * min(times), tk_created))
+
+
+BENCHMARKS = { "solver": bench_solver, "vector": bench_vector,
+               "incremental": bench_incremental, "gridsize": bench_gridsize,
+               "memory": bench_memory, "generate": bench_generate,
+               "encode": bench_encode, "headless": bench_headless,
+               "imports": bench_imports }
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -2,104 +2,79 @@
 Extends the Board class with specific features required for Boggle
 """
 
+import sys
+
 from graphics import *
 from brandom import *
-from bogglecube import BoggleCube
 from board import Board
-
-# CUBE_FACES stores a list of tuples that represent the unique legal faces
-# for BoggleCube objects
-CUBE_FACES = [("A", "A", "C", "I", "O", "T"),  # cube 0 
-              ("T", "Y", "A", "B", "I", "L"),  # cube 1
-              ("J", "M", "O", "QU", "A", "B"), # cube 2
-              ("A", "C", "D", "E", "M", "P"),  # cube 3
-              ("A", "C", "E", "L", "S", "R"),  # cube 4
-              ("A", "D", "E", "N", "V", "Z"),  # cube 5
-              ("A", "H", "M", "O", "R", "S"),  # cube 6
-              ("B", "F", "I", "O", "R", "X"),  # cube 7
-              ("D", "E", "N", "O", "S", "W"),  # cube 8
-              ("D", "K", "N", "O", "T", "U"),  # cube 9
-              ("E", "E", "F", "H", "I", "Y"),  # cube 10
-              ("E", "G", "I", "N", "T", "V"),  # cube 11
-              ("E", "G", "K", "L", "U", "Y"),  # cube 12
-              ("E", "H", "I", "N", "P", "S"),  # cube 13
-              ("E", "L", "P", "S", "T", "U"),  # cube 14
-              ("G", "I", "L", "R", "U", "W")]  # cube 15
+from bogglemodel import BoggleBoardModel
+# CUBE_FACES is re-exported for code that imported it from here
+from dice import CUBE_FACES, DEFAULT_DICE, get_dice
 
 
 class BoggleBoard(Board):
     """
-    BoggleBoard class implements the functionality of a Boggle board.
-    It inherits from the Board class and extends it by creating a list
-    of BoggleCubes, which can be shaken to randomize play.
-    Each BoggleCube corresponds to a specific (row, col) grid cell
-    on the board.
+    BoggleBoard class implements the display of a Boggle board.
+    It inherits from the Board class and extends it with a
+    BoggleBoardModel, a list of BoggleCubes which can be shaken to
+    randomize play.  Each BoggleCube corresponds to a specific
+    (row, col) grid cell on the board.
     """
 
-    # _cubes: a list of BoggleCube objects
-    
-    __slots__ = [ "_cubes" ]
+    # _model: the BoggleBoardModel holding the cubes
 
-    def __init__(self, win):
-        super().__init__(win, rows=4, cols=4)
+    __slots__ = [ "_model" ]
 
-        # todo: finish __init__
-        #initialize an empty list of cubes
-        self._cubes = []
-        #append bogglecube object(cubes) to list
-        for face in CUBE_FACES:
-            self._cubes.append(BoggleCube(face))
-        # call place_cubes_on_board() at the end of __init__
-        self.place_cubes_on_board()
-    def _which_row(self, cube_number) :
+    def __init__(self, win, dice_set=DEFAULT_DICE, model=None):
         """
-        The row of the board's grid that corresponds to the
-        BoggleCube at index cube_number
+        Creates a board for the named dice set (see dice.py), or a view
+        of the given BoggleBoardModel; its grid is sized to match, e.g.
+        4x4 for "classic" and 5x5 for "big".
         """
-        return cube_number // self._cols
+        if model is None:
+            model = BoggleBoardModel(dice_set)
+        super().__init__(win, rows=model.get_rows(), cols=model.get_cols())
+        self._model = model
+        # call place_cubes_on_board() at the end of __init__
+        self.place_cubes_on_board()
+
+    def get_model(self):
+        return self._model
+
+    def get_dice_set(self):
+        return self._model.get_dice_set()
 
-    def _which_col(self, cube_number) :
+    def to_packed(self):
         """
-        The column of the board's grid that corresponds
-        to the BoggleCube at index cube_number
+        Returns the current layout as a compact PackedBoard
         """
-        return cube_number % self._cols
+        return self._model.to_packed()
 
-    def _which_cube(self, row, col) :
+    def load_packed(self, packed):
         """
-        The index of the cube within the board's cube list that corresponds
-        to the cube appearing at cell (row,col) of the board's grid
+        Replaces the cubes with views of a PackedBoard's layout and
+        displays them.  The packed board must use this board's dice set.
         """
-        return (row*self._cols) + col
-    
+        self._model.load_packed(packed)
+        self.place_cubes_on_board()
+
     def get_bogglecube_at_point(self, point):
         """
         Return the BoggleCube at the given point in the window,
         or None if the click is outside the letter grid.
         """
-      
         # get_position returns grid coords
         row, col = self.get_position(point)
-        if row < 0 or col < 0:
-            return None
-        index = self._which_cube(row, col)
-        # return the booglecube using index
-        return self._cubes[index]
-
-
+        return self._model.get_bogglecube(row, col)
 
     def get_bogglecube_coords(self, bogglecube) :
         """
         Returns the a tuple of the (row, col) position that corresponds
-        to a given BoggleCube's position in the grid
+        to a given BoggleCube's position in the grid, or (-1, -1) if the
+        cube is not on this board.  Cubes are looked up by identity, so
+        two cubes showing the same faces are told apart.
         """
-        # check if present in self._cubes and return coordinates
-        for i in range(len(self._cubes)):
-            if self._cubes[i] == bogglecube:
-                return self._which_row(i), self._which_col(i)
-        return -1, -1
-
-
+        return self._model.get_bogglecube_coords(bogglecube)
 
     def reset(self):
         """
@@ -108,25 +83,21 @@ class BoggleBoard(Board):
         areas (right, lower, upper) on board.
         """
         # set game to its initial state
-        self.reset_grid_graphics()
-        self.set_string_to_lower_text("")
-        self.set_string_to_upper_text("")
-        self.set_string_to_text_area("")
-     
-     
+        with self._win.batch():
+            self.reset_grid_graphics()
+            self.set_string_to_lower_text("")
+            self.set_string_to_upper_text("")
+            self.set_string_to_text_area("")
 
     def shake_cubes(self):
         """
         Randomizes the BoggleCube locations and randomizes the visible
-        face for each BoggleCube.   
+        face for each BoggleCube.
         """
-        # randomize boggle cube locations and boggle cubes
-        self._cubes = shuffled(self._cubes)
-        for cube in self._cubes:
-            cube.randomize()
+        self._model.shake()
         # at the end call place_cubes_on_board to display new configuration
         self.place_cubes_on_board()
-        
+
     def is_adjacent(self, cube1, cube2):
         """
         Given two BoggleCubes, cube1 and cube2, checks if the cubes'
@@ -135,44 +106,59 @@ class BoggleBoard(Board):
         Two coordinates are considered adjacent if they are not the same, and
         if their corresponding row and col coordinates differ by at most 1.
         """
-        # generate coordinates and check adjacency
-        coord1 = self.get_bogglecube_coords(cube1)
-        coord2 = self.get_bogglecube_coords(cube2)
-        if coord2 == coord1:
-            return False
-        return abs(coord2[0] - coord1[0]) <= 1 and abs(coord2[1] - coord1[1]) <= 1
-    
+        return self._model.is_adjacent(cube1, cube2)
 
-    def place_cubes_on_board(self):
-        # DO NOT MODIFY  
-        '''Updates the board to display the letters on BoggleCubes'''
-        for i in range(len(self._cubes)):
-            r = self._which_row(i)
-            c = self._which_col(i)
-            self._grid[r][c].setText(self._cubes[i].get_letter())
+    def get_faces(self):
+        """
+        Returns a list of the visible faces of all cubes, in row-major order
+        """
+        return self._model.get_faces()
 
+    def solve(self, lexicon=None):
+        """
+        Returns a dict mapping every valid word on the current layout to
+        a list of (row, col) positions that spells it.  See
+        BoggleBoardModel.solve.
+        """
+        return self._model.solve(lexicon)
 
-    def __str__(self):
+    def find_paths(self, word, limit=None):
         """
-        Returns a string representation of this BoggleBoard.
-        DO NOT MODIFY.
+        Returns a list of up to limit ways (all if limit is None) to trace
+        word on the current layout.  See BoggleBoardModel.find_paths.
         """
+        return self._model.find_paths(word, limit)
 
-        if len(self._cubes) == 0:
-            return ''
+    def check_words(self, words, lexicon=None):
+        """
+        Validates a list of submitted words against the current layout.
+        See BoggleBoardModel.check_words.
+        """
+        return self._model.check_words(words, lexicon)
 
-        board = 'BoggleBoard:\n'
-        for row in range(self._rows):
-            board += str(row) + ": "
-            for col in range(self._cols):
-                cube = self._cubes[self._which_cube(row, col)]
+    def place_cubes_on_board(self):
+        '''
+        Updates the board to display the letters on BoggleCubes.  Only
+        cells whose letter changed are updated, all in one batch.
+        Returns the number of cells updated.
+        '''
+        changed = 0
+        with self._win.batch():
+            for i, cube in enumerate(self._model.get_cubes()):
+                cell = self._grid[i // self._cols][i % self._cols]
                 letter = cube.get_letter()
-                board += '[{}] '.format(letter)
-            board += '\n'
-        return board
+                if cell.getText() != letter:
+                    cell.setText(letter)
+                    changed += 1
+        return changed
+
+    def __str__(self):
+        """
+        Returns a string representation of this BoggleBoard.
+        """
+        return str(self._model)
 
 
-    
 if __name__ == "__main__":
     # Uncomment this code when you are ready to test it!
     # When you are ready to run on different boards,
@@ -180,8 +166,10 @@ if __name__ == "__main__":
     # find it much easier to test your code without
     # randomizing things!
     randomize()
-    win = GraphWin("Boggle", 400, 400)
-    board = BoggleBoard(win)
+    dice_set = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DICE
+    rows, cols, dice = get_dice(dice_set)
+    win = GraphWin("Boggle", *Board.window_size(rows, cols))
+    board = BoggleBoard(win, dice_set)
     print(board)
 
     board.draw_board()
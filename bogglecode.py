@@ -0,0 +1,141 @@
+"""
+Compact, bijective encoding of board layouts.
+
+A layout of a dice set is an arrangement of the dice plus the face each
+die shows.  It is numbered as a mixed-radix integer: first the Lehmer
+code of the arrangement (one digit per cell, with radix cells, cells-1,
+..., 1), then the face of every die in die-number order (radix: that
+die's number of faces).  Every integer below code_space(dice_set) is
+exactly one layout, so codes make compact cache and database keys, and
+any code can be decoded.
+
+A 64-bit code cannot hold every layout.  The classic dice have
+16! * 6**16, about 2**85.6, layouts, so a classic code needs 86 bits
+and is stored in 11 bytes (a PackedBoard takes 32).  A big 5x5 code
+takes 19 bytes.
+
+bogglegen.encode_boards and decode_boards do the same for arrays of
+boards at once.
+"""
+
+import math
+
+from dice import DEFAULT_DICE, get_dice
+from packedboard import PackedBoard
+
+
+def radices(dice):
+    """
+    Returns the radix of every digit of a code for a tuple of dice, most
+    significant first.
+    >>> rows, cols, dice = get_dice(DEFAULT_DICE)
+    >>> radices(dice)[:3], radices(dice)[-3:]
+    ([16, 15, 14], [6, 6, 6])
+    """
+    return list(range(len(dice), 0, -1)) + [ len(faces) for faces in dice ]
+
+
+def code_space(dice_set=DEFAULT_DICE):
+    """
+    Returns the number of layouts, i.e. the number of codes.
+    >>> code_space() == math.factorial(16) * 6 ** 16
+    True
+    """
+    return math.prod(radices(get_dice(dice_set)[2]))
+
+
+def code_bytes(dice_set=DEFAULT_DICE):
+    """
+    Returns the number of bytes taken by a code of the dice set.
+    >>> code_bytes(), code_bytes("big")
+    (11, 19)
+    """
+    return ((code_space(dice_set) - 1).bit_length() + 7) // 8
+
+
+def lehmer_digits(cubes):
+    """
+    Returns the Lehmer code of a permutation of range(len(cubes)).
+    >>> lehmer_digits([2, 0, 1])
+    [2, 0, 0]
+    """
+    return [ sum(1 for later in cubes[i + 1:] if later < cube)
+             for i, cube in enumerate(cubes) ]
+
+
+def encode_layout(cubes, faces, dice_set=DEFAULT_DICE):
+    """
+    Returns the code of a layout given as the die on each cell and the
+    index of its visible face, in row-major order.
+    >>> encode_layout(list(range(16)), [0] * 16)
+    0
+    """
+    dice = get_dice(dice_set)[2]
+    die_faces = [ 0 ] * len(dice)
+    for cube, face in zip(cubes, faces):
+        die_faces[cube] = face
+    code = 0
+    for radix, digit in zip(radices(dice), lehmer_digits(cubes) + die_faces):
+        code = code * radix + digit
+    return code
+
+
+def decode_layout(code, dice_set=DEFAULT_DICE):
+    """
+    Returns (cubes, faces) for a code made by encode_layout.
+    >>> decode_layout(encode_layout([1, 0] + list(range(2, 16)), [5] + [0] * 15))[1][:2]
+    [5, 0]
+    """
+    if not 0 <= code < code_space(dice_set):
+        raise ValueError("not a board code of dice set {!r}: {}".format(dice_set, code))
+    digits = []
+    for radix in reversed(radices(get_dice(dice_set)[2])):
+        code, digit = divmod(code, radix)
+        digits.append(digit)
+    digits.reverse()
+    cells = len(digits) // 2
+    unused = list(range(cells))
+    cubes = [ unused.pop(digit) for digit in digits[:cells] ]
+    die_faces = digits[cells:]
+    return cubes, [ die_faces[cube] for cube in cubes ]
+
+
+def encode(board, dice_set=DEFAULT_DICE):
+    """
+    Returns the code of a PackedBoard of the named dice set.
+    >>> from boggleid import board_from_id
+    >>> board = board_from_id(12345)
+    >>> decode(encode(board)) == board
+    True
+    """
+    if board.get_dice() != get_dice(dice_set)[2]:
+        raise ValueError("board does not use dice set {!r}".format(dice_set))
+    cells = len(board.get_dice())
+    state = board.to_bytes()
+    return encode_layout(list(state[:cells]), list(state[cells:]), dice_set)
+
+
+def decode(code, dice_set=DEFAULT_DICE):
+    """Returns the PackedBoard with the given code."""
+    rows, cols, dice = get_dice(dice_set)
+    cubes, faces = decode_layout(code, dice_set)
+    return PackedBoard.from_layout(dice, rows, cols, cubes, faces)
+
+
+def to_bytes(board, dice_set=DEFAULT_DICE):
+    """
+    Returns the code of a PackedBoard as code_bytes() big-endian bytes.
+    >>> from boggleid import board_from_id
+    >>> board = board_from_id(7)
+    >>> len(to_bytes(board)), from_bytes(to_bytes(board)) == board
+    (11, True)
+    """
+    return encode(board, dice_set).to_bytes(code_bytes(dice_set), "big")
+
+
+def from_bytes(data, dice_set=DEFAULT_DICE):
+    """Returns the PackedBoard encoded by to_bytes."""
+    if len(data) != code_bytes(dice_set):
+        raise ValueError("a {!r} board code takes {} bytes".format(dice_set, code_bytes(dice_set)))
+    return decode(int.from_bytes(data, "big"), dice_set)
+
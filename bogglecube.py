@@ -2,8 +2,6 @@
 Implements the functionality of a single cube on the Boggle board.
 """
 
-from graphics import *
-from board import Board
 from brandom import random_int
 
 class BoggleCube:
@@ -36,6 +34,18 @@ class BoggleCube:
         #return the visible face
         return self._faces[self._face_idx]
 
+    def get_faces(self):
+        """
+        Returns the tuple of all faces of the cube
+        """
+        return self._faces
+
+    def get_face_idx(self):
+        """
+        Returns the index of the visible face within get_faces()
+        """
+        return self._face_idx
+
     def randomize(self):
         """
         Randomly sets one of the BoggleCube's faces to be visible.
@@ -79,6 +89,7 @@ if __name__ == "__main__":
     # are confident that the class is close to complete.
     # You are strongly encouraged to add more tests.
     
+    from graphics import GraphWin
     from board import Board
     win = GraphWin("Boggle", 400, 400)
     n = 4
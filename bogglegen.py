@@ -0,0 +1,276 @@
+"""
+Bulk generation of random Boggle boards with NumPy.
+
+BoggleBoard.shake_cubes makes one board at a time: it copies and
+shuffles the list of cubes, then rolls each cube.  Here a whole batch
+is made at once: the cube permutation of every board comes from one
+argsort of a (boards, cells) array of uniform numbers, and every face
+is drawn from one more such array.
+
+Layouts come back in the PackedBoard form: a uint8 array of die numbers
+and a uint8 array of face indices, each of shape (boards, cells).  The
+permutations and the faces are drawn from two independent streams
+spawned from the seed, so the boards for a seed are the same whatever
+batch_size they are generated with.
+
+boards_from_ids instead makes the boards that boggleid numbers, so
+any range of board numbers can be made on its own, e.g. one range per
+worker process.  encode_boards and decode_boards convert layouts to and
+from the compact codes of bogglecode.
+
+Usage:
+    python bogglegen.py [-n COUNT] [--seed SEED] [--first ID] [--dice SET]
+
+This module requires NumPy; the rest of the game does not.
+"""
+
+import argparse
+
+import numpy as np
+
+import bogglecode
+import bogglesolver
+from boggleid import GAMMA, MASK64, mix64
+from dice import DEFAULT_DICE, get_dice
+from packedboard import BoardStore
+
+
+def iter_boards(count, dice_set=DEFAULT_DICE, seed=None, batch_size=65536):
+    """
+    Yields (cubes, faces) array pairs for count random boards of the
+    named dice set, at most batch_size boards at a time.
+    """
+    rows, cols, dice = get_dice(dice_set)
+    cells = rows * cols
+    if cells > 256:
+        raise ValueError("boards with more than 256 cells cannot be packed")
+    sides = np.array([ len(faces) for faces in dice ], dtype=np.float64)
+    shuffle_rng, roll_rng = [ np.random.default_rng(child)
+                              for child in np.random.SeedSequence(seed).spawn(2) ]
+
+    for start in range(0, count, batch_size):
+        n = min(batch_size, count - start)
+        cubes = shuffle_rng.random((n, cells)).argsort(axis=1).astype(np.uint8)
+        faces = (roll_rng.random((n, cells)) * sides[cubes]).astype(np.uint8)
+        yield cubes, faces
+
+
+def shake_boards(count, dice_set=DEFAULT_DICE, seed=None):
+    """
+    Returns (cubes, faces) for count random boards of the named dice
+    set: two uint8 arrays of shape (count, cells) giving, in row-major
+    order, the die on each cell and the index of its visible face.
+    >>> cubes, faces = shake_boards(1000, seed=1)
+    >>> cubes.shape, faces.shape
+    ((1000, 16), (1000, 16))
+    >>> bool((np.sort(cubes, axis=1) == np.arange(16)).all())
+    True
+    >>> bool((faces < 6).all())
+    True
+    """
+    cells = len(get_dice(dice_set)[2])
+    batches = list(iter_boards(count, dice_set, seed))
+    if not batches:
+        empty = np.zeros((0, cells), dtype=np.uint8)
+        return empty, empty.copy()
+    return (np.concatenate([ cubes for cubes, faces in batches ]),
+            np.concatenate([ faces for cubes, faces in batches ]))
+
+
+def _mix64(z):
+    """boggleid.mix64 for a uint64 array."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def boards_from_ids(board_ids, dice_set=DEFAULT_DICE, seed=0):
+    """
+    Returns (cubes, faces) arrays for an array of board numbers, equal
+    row for row to boggleid.layout_from_id.
+    >>> import boggleid
+    >>> cubes, faces = boards_from_ids([0, 5, 10**12], seed=3)
+    >>> (cubes[2].tolist(), faces[2].tolist()) == boggleid.layout_from_id(10**12, seed=3)
+    True
+    """
+    dice = get_dice(dice_set)[2]
+    cells = len(dice)
+    ids = np.asarray(board_ids, dtype=np.uint64).reshape(-1)
+    n = len(ids)
+    gamma = np.uint64(GAMMA)
+    # uint64 array arithmetic wraps around, as the & MASK64 does in boggleid
+    key = _mix64(np.uint64(mix64(seed & MASK64)) + ids * gamma)
+    counters = np.arange(1, 2 * cells, dtype=np.uint64) * gamma
+    values = _mix64(key[:, None] + counters)
+
+    rows = np.arange(n)
+    cubes = np.tile(np.arange(cells, dtype=np.uint8), (n, 1))
+    for t, i in enumerate(range(cells - 1, 0, -1)):
+        j = (values[:, t] % np.uint64(i + 1)).astype(np.intp)
+        swapped = cubes[rows, j]
+        cubes[rows, j] = cubes[:, i]
+        cubes[:, i] = swapped
+    sides = np.array([ len(faces) for faces in dice ], dtype=np.uint64)
+    faces = (values[:, cells - 1:] % sides[cubes]).astype(np.uint8)
+    return cubes, faces
+
+
+def _digit_groups(radices):
+    """
+    Splits a list of radices into runs whose product fits in 32 bits.
+    Returns a list of (first index, end index, product of radices).
+    """
+    groups = []
+    first, product = 0, 1
+    for k, radix in enumerate(radices):
+        if product * radix >= 1 << 32:
+            groups.append((first, k, product))
+            first, product = k, 1
+        product *= radix
+    groups.append((first, len(radices), product))
+    return groups
+
+
+def encode_boards(cubes, faces, dice_set=DEFAULT_DICE):
+    """
+    Returns the bogglecode codes of (cubes, faces) arrays as a uint8
+    array of shape (n, bogglecode.code_bytes(dice_set)), each row a
+    big-endian code, equal to bogglecode.to_bytes board by board.
+    >>> import bogglecode, boggleid
+    >>> codes = encode_boards(*boards_from_ids([3, 4]))
+    >>> codes.shape, codes[1].tobytes() == bogglecode.to_bytes(boggleid.board_from_id(4))
+    ((2, 11), True)
+    """
+    dice = get_dice(dice_set)[2]
+    cubes = np.asarray(cubes, dtype=np.uint8)
+    faces = np.asarray(faces, dtype=np.uint8)
+    n, cells = cubes.shape
+    size = bogglecode.code_bytes(dice_set)
+
+    # the digits of each code, most significant first, as in bogglecode
+    digits = np.zeros((n, 2 * cells), dtype=np.uint64)
+    for cell in range(cells - 1):
+        digits[:, cell] = np.count_nonzero(cubes[:, cell + 1:] < cubes[:, cell:cell + 1], axis=1)
+    digits[np.arange(n)[:, None], cells + cubes.astype(np.intp)] = faces
+    dice_radices = bogglecode.radices(dice)
+
+    # code = code * radix + digit, on little-endian 32-bit limbs, taking
+    # as many digits at a time as fit in 32 bits
+    limbs = np.zeros((n, (size + 3) // 4), dtype=np.uint64)
+    low = np.uint64(0xFFFFFFFF)
+    for first, last, radix in _digit_groups(dice_radices):
+        carry = np.zeros(n, dtype=np.uint64)
+        for k in range(first, last):
+            carry = carry * np.uint64(dice_radices[k]) + digits[:, k]
+        for i in range(limbs.shape[1]):
+            value = limbs[:, i] * np.uint64(radix) + carry
+            limbs[:, i] = value & low
+            carry = value >> np.uint64(32)
+    data = limbs.astype("<u4").view(np.uint8)
+    return data[:, size - 1::-1] if size else data[:, :0]
+
+
+def decode_boards(codes, dice_set=DEFAULT_DICE):
+    """
+    Returns (cubes, faces) arrays for a uint8 array of codes made by
+    encode_boards.
+    >>> cubes, faces = boards_from_ids(range(100), seed=1)
+    >>> again = decode_boards(encode_boards(cubes, faces))
+    >>> bool((again[0] == cubes).all() and (again[1] == faces).all())
+    True
+    """
+    dice = get_dice(dice_set)[2]
+    cells = len(dice)
+    codes = np.asarray(codes, dtype=np.uint8)
+    n = len(codes)
+    size = bogglecode.code_bytes(dice_set)
+    if codes.ndim != 2 or codes.shape[1] != size:
+        raise ValueError("expected an array of shape (n, {})".format(size))
+
+    count = (size + 3) // 4
+    padded = np.zeros((n, 4 * count), dtype=np.uint8)
+    padded[:, :size] = codes[:, ::-1]
+    limbs = padded.view("<u4").astype(np.uint64)
+
+    # peel the digits off, least significant group first
+    dice_radices = bogglecode.radices(dice)
+    digits = np.zeros((n, len(dice_radices)), dtype=np.int64)
+    for first, last, radix in reversed(_digit_groups(dice_radices)):
+        radix = np.uint64(radix)
+        remainder = np.zeros(n, dtype=np.uint64)
+        for i in range(count - 1, -1, -1):
+            value = (remainder << np.uint64(32)) | limbs[:, i]
+            limbs[:, i] = value // radix
+            remainder = value % radix
+        for k in range(last - 1, first - 1, -1):
+            remainder, digits[:, k] = np.divmod(remainder, np.uint64(dice_radices[k]))
+    if limbs.any():
+        raise ValueError("codes out of range for dice set {!r}".format(dice_set))
+
+    # undo the Lehmer code from the right: every later die at or above
+    # the die chosen at a cell moves up by one
+    cubes = digits[:, :cells].astype(np.uint8)
+    for cell in range(cells - 2, -1, -1):
+        cubes[:, cell + 1:] += cubes[:, cell + 1:] >= cubes[:, cell:cell + 1]
+    faces = digits[:, cells:][np.arange(n)[:, None], cubes].astype(np.uint8)
+    return cubes, faces
+
+
+def symbol_table(dice):
+    """
+    Returns a (dice, faces) uint8 array of the lexicon symbol of every
+    face of every die, padded with zeros for dice with fewer faces.
+    """
+    table = np.zeros((len(dice), max(len(faces) for faces in dice)), dtype=np.uint8)
+    for number, faces in enumerate(dice):
+        table[number, :len(faces)] = bogglesolver.face_symbols(faces)
+    return table
+
+
+def board_symbols(cubes, faces, dice_set=DEFAULT_DICE):
+    """
+    Converts (cubes, faces) arrays to the array of lexicon symbols that
+    bogglevec.solve_boards takes.
+    >>> cubes, faces = shake_boards(3, seed=2)
+    >>> board_symbols(cubes, faces).shape
+    (3, 16)
+    """
+    return symbol_table(get_dice(dice_set)[2])[cubes, faces]
+
+
+def to_store(cubes, faces, dice_set=DEFAULT_DICE, store=None):
+    """
+    Appends (cubes, faces) arrays to a BoardStore of the named dice set
+    (a new one unless store is given) and returns the store.
+    >>> store = to_store(*shake_boards(10, seed=3))
+    >>> len(store), store.nbytes()
+    (10, 320)
+    """
+    if store is None:
+        store = BoardStore(dice_set)
+    store.extend(np.concatenate([ cubes, faces ], axis=1).tobytes())
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print random Boggle boards.")
+    parser.add_argument("-n", "--count", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--first", type=int, default=None,
+                        help="print boards FIRST, FIRST+1, ... as numbered by boggleid")
+    parser.add_argument("--dice", default=DEFAULT_DICE, help="dice set from dice.py")
+    args = parser.parse_args(argv)
+    dice = get_dice(args.dice)[2]
+    # one line per board, in the format bogglebatch.py reads
+    if args.first is None:
+        batches = iter_boards(args.count, args.dice, args.seed)
+    else:
+        batches = [ boards_from_ids(np.arange(args.first, args.first + args.count),
+                                    args.dice, args.seed or 0) ]
+    for cubes, faces in batches:
+        for board_cubes, board_faces in zip(cubes.tolist(), faces.tolist()):
+            print(" ".join(dice[cube][face] for cube, face in zip(board_cubes, board_faces)))
+
+
+if __name__ == "__main__":
+    main()
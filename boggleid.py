@@ -0,0 +1,115 @@
+"""
+Seed-addressable boards: board number k of a seed, made directly.
+
+brandom draws from the one global random stream, so the millionth
+board of a run can only be reproduced by making the 999,999 before it.
+Here every board has its own stream instead.  The random numbers for
+board k are splitmix64 hashes of a counter keyed by (seed, k), so any
+board can be made on its own, in any order, in any process, and a
+board can be shared as just its dice set, seed and number.
+
+The layout is made the way shake_cubes makes it: a Fisher-Yates
+shuffle of the dice, then a roll of each die.  Draws are reduced with
+a plain modulo; with 64-bit draws and at most 256 choices the bias is
+below 2**-56.
+
+bogglegen.boards_from_ids makes the same layouts for a whole array of
+board numbers at once.
+"""
+
+from dice import DEFAULT_DICE, get_dice
+from packedboard import PackedBoard
+
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+
+
+def mix64(z):
+    """
+    The splitmix64 finalizer: a bijective hash of a 64-bit integer.
+    >>> hex(mix64(1))
+    '0x5692161d100b05e5'
+    """
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def board_key(seed, board_id):
+    """Returns the 64-bit key of the stream for board board_id of seed."""
+    return mix64((mix64(seed & MASK64) + board_id * GAMMA) & MASK64)
+
+
+def draws(seed, board_id, count):
+    """Returns the first count 64-bit draws of board board_id of seed."""
+    key = board_key(seed, board_id)
+    return [ mix64((key + (t + 1) * GAMMA) & MASK64) for t in range(count) ]
+
+
+def layout_from_id(board_id, dice_set=DEFAULT_DICE, seed=0):
+    """
+    Returns (cubes, faces) for board board_id: the die on each cell and
+    the index of its visible face, in row-major order.
+    >>> layout_from_id(1000000) == layout_from_id(1000000)
+    True
+    >>> sorted(layout_from_id(7)[0]) == list(range(16))
+    True
+    """
+    if board_id < 0:
+        raise ValueError("board ids must not be negative")
+    dice = get_dice(dice_set)[2]
+    cells = len(dice)
+    values = draws(seed, board_id, 2 * cells - 1)
+    cubes = list(range(cells))
+    for t, i in enumerate(range(cells - 1, 0, -1)):
+        j = values[t] % (i + 1)
+        cubes[i], cubes[j] = cubes[j], cubes[i]
+    faces = [ values[cells - 1 + cell] % len(dice[cube]) for cell, cube in enumerate(cubes) ]
+    return cubes, faces
+
+
+def board_from_id(board_id, dice_set=DEFAULT_DICE, seed=0):
+    """
+    Returns board board_id of seed as a PackedBoard.
+    >>> board_from_id(42, seed=7) == board_from_id(42, seed=7)
+    True
+    >>> board_from_id(42, seed=7) == board_from_id(43, seed=7)
+    False
+    """
+    rows, cols, dice = get_dice(dice_set)
+    cubes, faces = layout_from_id(board_id, dice_set, seed)
+    return PackedBoard.from_layout(dice, rows, cols, cubes, faces)
+
+
+def format_board_id(board_id, dice_set=DEFAULT_DICE, seed=0):
+    """
+    Returns a short shareable name for a board.  Seeds are written as
+    the 64-bit value board_key uses, so negative seeds parse back too.
+    >>> format_board_id(1000000, seed=7)
+    'classic-7-1000000'
+    >>> parse_board_id(format_board_id(5, seed=-1))
+    (5, 'classic', 18446744073709551615)
+    >>> board_from_id(*parse_board_id(format_board_id(5, seed=-1))) == board_from_id(5, seed=-1)
+    True
+    """
+    return "{}-{}-{}".format(dice_set, seed & MASK64, board_id)
+
+
+def parse_board_id(text):
+    """
+    Parses a name made by format_board_id into (board_id, dice_set, seed).
+    >>> parse_board_id("big-7-12")
+    (12, 'big', 7)
+    """
+    try:
+        dice_set, seed, board_id = text.rsplit("-", 2)
+        return int(board_id), dice_set, int(seed)
+    except ValueError:
+        raise ValueError("not a board id: {!r}".format(text)) from None
+
+
+if __name__ == "__main__":
+    import sys
+    for text in sys.argv[1:]:
+        print(text)
+        print(board_from_id(*parse_board_id(text)))
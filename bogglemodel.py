@@ -0,0 +1,424 @@
+"""
+The Boggle game model, with no graphics.
+
+BoggleBoardModel holds the cubes of a board and BoggleGameModel the
+state of a game played on it: the cubes selected this turn and the
+words found so far.  Neither imports graphics, so games can be created
+and played headlessly, e.g. on a server, by calling select(row, col)
+for each click.
+
+A view follows a game by adding itself as an observer.  An observer is
+any object with these methods, which the game calls as its state
+changes:
+
+    cubes_placed()                   the cubes were (re)arranged
+    cube_highlighted(row, col, current)
+                                     a selected cube should be shown as
+                                     the current cube or as visited
+    word_changed(word)               the word spelled this turn
+    message_changed(text)            a message for the player
+    found_words_changed(words)       the list of words found
+    turn_reset()                     the selection was cleared
+    game_reset()                     a new game is starting
+
+BoggleBoard and BoggleGame are the Tk view of these models.
+"""
+
+from concurrent.futures import Future
+
+import bogglesolver
+from bogglecube import BoggleCube
+from brandom import shuffled
+from dice import DEFAULT_DICE, get_dice
+from lexicon import DEFAULT_LEXICON, get_lexicon, get_lexicon_async
+from packedboard import PackedBoard
+
+
+class BoggleBoardModel:
+    """
+    The cubes of a Boggle board: a rows x cols grid of BoggleCubes,
+    which can be shaken to randomize play.
+    >>> board = BoggleBoardModel()
+    >>> board.get_rows(), board.get_cols(), len(board.get_faces())
+    (4, 4, 16)
+    >>> board.get_bogglecube_coords(board.get_bogglecube(2, 3))
+    (2, 3)
+    """
+
+    # _dice_set: name of the dice set the cubes were made from
+    # _rows, _cols: the shape of the grid
+    # _cubes: a list of BoggleCube objects, in row-major order
+    # _face_index: bogglesolver.face_index of the current layout, built
+    #              on demand and cleared whenever the cubes are placed
+    # _positions: maps id(cube) to the cube's index in _cubes; rebuilt
+    #             whenever the cubes are placed
+
+    __slots__ = [ "_dice_set", "_rows", "_cols", "_cubes", "_face_index", "_positions" ]
+
+    def __init__(self, dice_set=DEFAULT_DICE):
+        """
+        Creates a board for the named dice set (see dice.py), e.g. 4x4
+        for "classic" and 5x5 for "big".
+        """
+        rows, cols, dice = get_dice(dice_set)
+        self._dice_set = dice_set
+        self._rows = rows
+        self._cols = cols
+        self._cubes = [ BoggleCube(faces) for faces in dice ]
+        self.place_cubes()
+
+    def get_dice_set(self):
+        return self._dice_set
+
+    def get_rows(self):
+        return self._rows
+
+    def get_cols(self):
+        return self._cols
+
+    def get_cubes(self):
+        return self._cubes
+
+    def place_cubes(self):
+        """
+        Updates the lookup tables after the cubes have been rearranged
+        """
+        self._face_index = None
+        self._positions = { id(cube): i for i, cube in enumerate(self._cubes) }
+
+    def shake(self):
+        """
+        Randomizes the BoggleCube locations and the visible face of each
+        BoggleCube.
+        """
+        self._cubes = shuffled(self._cubes)
+        for cube in self._cubes:
+            cube.randomize()
+        self.place_cubes()
+
+    def to_packed(self):
+        """
+        Returns the current layout as a compact PackedBoard
+        """
+        rows, cols, dice = get_dice(self._dice_set)
+        return PackedBoard.from_cubes(dice, rows, cols, self._cubes)
+
+    def load_packed(self, packed):
+        """
+        Replaces the cubes with views of a PackedBoard's layout.  The
+        packed board must use this board's dice set.
+        >>> board, other = BoggleBoardModel(), BoggleBoardModel()
+        >>> other.load_packed(board.to_packed())
+        >>> other.get_faces() == board.get_faces(), other.to_packed() == board.to_packed()
+        (True, True)
+        """
+        if packed.get_dice() != get_dice(self._dice_set)[2]:
+            raise ValueError("packed board uses a different dice set")
+        self._cubes = packed.make_cubes()
+        self.place_cubes()
+
+    def get_bogglecube(self, row, col):
+        """
+        Returns the BoggleCube at (row, col), or None if (row, col) is
+        outside the grid.
+        """
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return None
+        return self._cubes[row * self._cols + col]
+
+    def get_bogglecube_coords(self, bogglecube):
+        """
+        Returns the (row, col) position of a given BoggleCube, or (-1, -1)
+        if the cube is not on this board.  Cubes are looked up by
+        identity, so two cubes showing the same faces are told apart.
+        """
+        i = self._positions.get(id(bogglecube))
+        if i is None:
+            return -1, -1
+        return divmod(i, self._cols)
+
+    def is_adjacent(self, cube1, cube2):
+        """
+        Returns True if the two BoggleCubes are on different, touching
+        cells (including diagonally), and False otherwise.
+        """
+        coord1 = self.get_bogglecube_coords(cube1)
+        coord2 = self.get_bogglecube_coords(cube2)
+        if coord2 == coord1:
+            return False
+        return abs(coord2[0] - coord1[0]) <= 1 and abs(coord2[1] - coord1[1]) <= 1
+
+    def get_faces(self):
+        """
+        Returns a list of the visible faces of all cubes, in row-major order
+        """
+        return [ cube.get_letter() for cube in self._cubes ]
+
+    def solve(self, lexicon=None):
+        """
+        Returns a dict mapping every valid word on the current layout to
+        a list of (row, col) positions that spells it.  See
+        bogglesolver.solve.  Solutions come from a shared cache in which
+        rotations and reflections of a board share one entry.
+        """
+        return bogglesolver.solve_cached(self.get_faces(), self._rows, self._cols, lexicon)
+
+    def find_paths(self, word, limit=None):
+        """
+        Returns a list of up to limit ways (all if limit is None) to trace
+        word on the current layout, each a list of (row, col) positions.
+        The list is empty if word cannot be traced.  Uses an index from
+        faces to positions, so no clicks need to be simulated.
+        """
+        if self._face_index is None:
+            self._face_index = bogglesolver.face_index(self.get_faces())
+        return bogglesolver.find_paths(word, None, self._rows, self._cols,
+                                       limit, self._face_index)
+
+    def check_words(self, words, lexicon=None):
+        """
+        Validates a list of submitted words against the current layout.
+        Returns a dict mapping each word (upper-cased) to a path that
+        traces it, or to None if the word is too short, not in the
+        lexicon, or cannot be traced on the board.
+        """
+        if lexicon is None:
+            lexicon = get_lexicon()
+        result = {}
+        for word in words:
+            word = word.upper()
+            path = None
+            if len(word) >= bogglesolver.MIN_WORD_LENGTH and word in lexicon:
+                paths = self.find_paths(word, limit=1)
+                if paths:
+                    path = paths[0]
+            result[word] = path
+        return result
+
+    def __str__(self):
+        """
+        Returns a string representation of this board.
+        """
+        if len(self._cubes) == 0:
+            return ''
+
+        board = 'BoggleBoard:\n'
+        for row in range(self._rows):
+            board += str(row) + ": "
+            for col in range(self._cols):
+                letter = self._cubes[row * self._cols + col].get_letter()
+                board += '[{}] '.format(letter)
+            board += '\n'
+        return board
+
+
+class BoggleGameModel:
+    """
+    The state of one game of Boggle: the board, the cubes selected in
+    the current turn and the words found so far.
+
+    An observer that logs every event but the highlights, on the
+    unshaken classic board (rows ATJA, AAAB, DDEE, EEEG):
+    >>> class Log:
+    ...     def cube_highlighted(self, row, col, current):
+    ...         pass
+    ...     def __getattr__(self, event):
+    ...         return lambda *args: print(event, *map(repr, args))
+    >>> game = BoggleGameModel(lexicon=get_lexicon())
+    >>> game.add_observer(Log())
+
+    Clicking adjacent cubes extends the word, and clicking the last
+    cube again submits it:
+    >>> game.select(2, 2); game.select(1, 2); game.select(0, 1)
+    message_changed ''
+    word_changed 'E'
+    word_changed 'EA'
+    word_changed 'EAT'
+    >>> game.select(0, 1)
+    found_words_changed ['EAT']
+    turn_reset
+    >>> game.get_found_words(), game.get_score()
+    (['EAT'], 1)
+
+    A click on a cube not next to the last one ends the turn:
+    >>> game.select(0, 0); game.select(3, 3)
+    message_changed ''
+    word_changed 'A'
+    turn_reset
+    >>> game.get_word()
+    ''
+
+    So does a dead end, a word that no valid word starts with:
+    >>> game.select(0, 2); game.select(1, 3)
+    message_changed ''
+    word_changed 'J'
+    turn_reset
+    message_changed 'No words start with JB'
+
+    Resetting the game clears the words found and shakes the board:
+    >>> game.reset_game()
+    game_reset
+    cubes_placed
+    >>> game.get_found_words()
+    []
+    """
+
+    # _board: the BoggleBoardModel
+    # _lexicon_future: a Future that resolves to the Lexicon of all valid
+    #                  Boggle words
+    # _found_words: a list of strings of all words found so far
+    # _selected_cubes: a list of BoggleCubes selected in current turn
+    # _observers: objects notified of changes, see the module docstring
+
+    __slots__ = [ "_board", "_lexicon_future", "_found_words", "_selected_cubes",
+                  "_observers" ]
+
+    def __init__(self, dice_set=DEFAULT_DICE, lexicon=None, board=None):
+        """
+        Creates a game with the named dice set (see dice.py), or on the
+        given BoggleBoardModel.  lexicon may be a Lexicon or a Future
+        for one; by default the shared lexicon is loaded in the
+        background.
+        """
+        if board is None:
+            board = BoggleBoardModel(dice_set)
+        if lexicon is None:
+            lexicon = get_lexicon_async(DEFAULT_LEXICON)
+        elif not isinstance(lexicon, Future):
+            loaded = Future()
+            loaded.set_result(lexicon)
+            lexicon = loaded
+        self._board = board
+        self._lexicon_future = lexicon
+        self._found_words = []
+        self._selected_cubes = []
+        self._observers = []
+
+    def add_observer(self, observer):
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        self._observers.remove(observer)
+
+    def __notify(self, event, *args):
+        for observer in self._observers:
+            getattr(observer, event)(*args)
+
+    def get_board(self):
+        return self._board
+
+    def get_lexicon(self):
+        """
+        Returns the Lexicon of valid words, waiting for it to finish
+        loading if necessary.
+        """
+        return self._lexicon_future.result()
+
+    def get_found_words(self):
+        return self._found_words
+
+    def get_selected_cubes(self):
+        return self._selected_cubes
+
+    def get_word(self):
+        """
+        Returns the word spelled by the visible face of all selected cubes
+        """
+        return "".join(cube.get_letter() for cube in self._selected_cubes)
+
+    def get_score(self):
+        """Returns the total score of the words found so far"""
+        return bogglesolver.total_score(self._found_words)
+
+    def reset_game(self):
+        """
+        Starts a new game: clears the words found and shakes the board
+        """
+        self._selected_cubes = []
+        self._found_words = []
+        self.__notify("game_reset")
+        self._board.shake()
+        self.__notify("cubes_placed")
+
+    def reset_turn(self):
+        """
+        Clears the cubes selected in the current turn
+        """
+        self._selected_cubes = []
+        self.__notify("turn_reset")
+
+    def __highlight(self, cube, current):
+        row, col = self._board.get_bogglecube_coords(cube)
+        self.__notify("cube_highlighted", row, col, current)
+
+    def select(self, row, col):
+        """
+        Plays a click on the cube at (row, col).  Clicking a cube next to
+        the last one selected extends the word; clicking the last one
+        again submits the word; any other click ends the turn.  Clicks
+        outside the grid also end the turn.
+        """
+        current_cube = self._board.get_bogglecube(row, col)
+        if current_cube is None:
+            self.reset_turn()
+            return
+        self.__highlight(current_cube, True)
+        if len(self._selected_cubes) == 0:
+            self.__notify("message_changed", "")
+            self._selected_cubes.append(current_cube)
+            self.__notify("word_changed", self.get_word())
+            return
+
+        last_cube = self._selected_cubes[-1]
+        self.__highlight(last_cube, False)
+        if all(cube is not current_cube for cube in self._selected_cubes) and \
+           self._board.is_adjacent(current_cube, last_cube):
+            self._selected_cubes.append(current_cube)
+            word = self.get_word()
+            # reject a dead end right away: no word can be completed
+            # (skipped rather than waited for while still loading)
+            if not self._lexicon_future.done() or self.get_lexicon().is_prefix(word):
+                self.__notify("word_changed", word)
+            else:
+                self.reset_turn()
+                self.__notify("message_changed", "No words start with " + word)
+        elif current_cube is last_cube:
+            word = self.get_word()
+            if len(word) >= bogglesolver.MIN_WORD_LENGTH and word in self.get_lexicon() \
+               and word not in self._found_words:
+                self._found_words.append(word)
+                self.__notify("found_words_changed", self._found_words)
+            self.reset_turn()
+        elif not self._board.is_adjacent(current_cube, last_cube):
+            self.reset_turn()
+
+    def enter_word(self, word):
+        """
+        Plays word as clicks along the first path that traces it, then
+        submits it.  Returns True if the word was accepted as new.  A
+        string that is not a valid word is never played, even if it ends
+        in one.
+        >>> game = BoggleGameModel(lexicon=get_lexicon())
+        >>> "".join(game.get_board().get_faces())
+        'ATJAAAABDDEEEEEG'
+        >>> game.enter_word("JBEAT")
+        False
+        >>> game.enter_word("eat"), game.enter_word("EAT"), game.get_found_words()
+        (True, False, ['EAT'])
+        """
+        word = word.upper()
+        if len(word) < bogglesolver.MIN_WORD_LENGTH or word not in self.get_lexicon():
+            return False
+        paths = self._board.find_paths(word, limit=1)
+        if not paths:
+            return False
+        self.reset_turn()
+        found = len(self._found_words)
+        for row, col in paths[0]:
+            self.select(row, col)
+            if not self._selected_cubes:
+                # the turn was reset part way, e.g. at a dead end; what is
+                # left of the path is not the word
+                return False
+        self.select(*paths[0][-1])
+        return len(self._found_words) > found
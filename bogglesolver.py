@@ -0,0 +1,566 @@
+"""
+Finds every valid word on a Boggle board.
+
+Boards are described by their visible faces in row-major order (the same
+order BoggleBoard keeps its cubes in), so the solver does not depend on
+the graphics module.  Words are found by a depth-first walk of the grid
+that follows the lexicon's DAWG one face symbol at a time and abandons
+a path as soon as no word starts with its letters.
+
+Cells are numbered row * cols + col.  The cubes used by a path are kept
+as an int bitmask, and the cells adjacent to each cell come from a table
+computed once per (rows, cols), so the inner loop does no coordinate
+arithmetic, list scans or allocations beyond its explicit stack.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+from lexicon import FACE_SYMBOLS, NUM_SYMBOLS, get_lexicon, tokenize
+
+# MIN_WORD_LENGTH: the fewest letters a word may have to count
+MIN_WORD_LENGTH = 3
+
+# _SCORES: points awarded for a word, indexed by its number of letters
+_SCORES = [0, 0, 0, 1, 1, 2, 3, 5]
+_LONG_WORD_SCORE = 11
+
+
+def word_score(word):
+    """
+    Returns the points awarded for word under the standard Boggle rules
+    (a "QU" face counts as two letters).
+    >>> [word_score(w) for w in ["AT", "CAT", "QUIT", "QUITE", "QUIETLY"]]
+    [0, 1, 1, 2, 5]
+    """
+    if len(word) < len(_SCORES):
+        return _SCORES[len(word)]
+    return _LONG_WORD_SCORE
+
+
+def total_score(words):
+    """
+    Returns the total points for an iterable of words.
+    """
+    return sum(word_score(word) for word in words)
+
+
+def face_symbols(faces):
+    """
+    Converts a sequence of faces (e.g. "A" or "QU") to lexicon symbols.
+    Raises ValueError for a face that is not in the lexicon's alphabet.
+    """
+    try:
+        return [ FACE_SYMBOLS[face.upper()] for face in faces ]
+    except KeyError as e:
+        raise ValueError("unknown cube face {}".format(e))
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(rows, cols):
+    """
+    Returns a tuple indexed by cell number; entry i is a tuple of
+    (cell, bit) pairs for every cell adjacent to cell i on a rows x cols
+    board, where bit is 1 << cell.  Adjacency follows
+    BoggleBoard.is_adjacent.  Tables are computed once per board shape.
+    >>> [cell for cell, bit in neighbor_table(3, 3)[0]]
+    [1, 3, 4]
+    """
+    table = []
+    for cell in range(rows * cols):
+        row, col = divmod(cell, cols)
+        table.append(tuple((r * cols + c, 1 << (r * cols + c))
+                           for r in range(max(row - 1, 0), min(row + 2, rows))
+                           for c in range(max(col - 1, 0), min(col + 2, cols))
+                           if (r, c) != (row, col)))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def neighbor_masks(rows, cols):
+    """
+    Returns a tuple indexed by cell number; entry i is a bitmask of the
+    cells adjacent to cell i on a rows x cols board.
+    >>> bin(neighbor_masks(3, 3)[0])
+    '0b11010'
+    """
+    return tuple(sum(bit for cell, bit in neighbors) for neighbors in neighbor_table(rows, cols))
+
+
+def face_index(faces):
+    """
+    Returns a list indexed by face symbol; entry s is a bitmask of the
+    cells (in row-major order) showing that face.
+    """
+    index = [ 0 ] * NUM_SYMBOLS
+    for cell, symbol in enumerate(face_symbols(faces)):
+        index[symbol] |= 1 << cell
+    return index
+
+
+def find_paths(word, faces, rows, cols, limit=None, index=None):
+    """
+    Returns a list of up to limit paths (all of them if limit is None)
+    that trace word on the board, each a list of (row, col) tuples;
+    the list is empty if word cannot be traced.  The word is not looked
+    up in any lexicon.  index is the board's face_index(faces), which
+    callers checking many words should build once and pass in.
+    >>> find_paths("quit", ["QU", "I", "X", "T"], 2, 2)
+    [[(0, 0), (0, 1), (1, 1)]]
+    >>> find_paths("tit", ["QU", "I", "X", "T"], 2, 2)
+    []
+    """
+    symbols = tokenize(word)
+    if not symbols:
+        return []
+    if index is None:
+        index = face_index(faces)
+    masks = neighbor_masks(rows, cols)
+    last = len(symbols) - 1
+    paths = []
+    path = [ 0 ] * len(symbols)
+
+    def extend(depth, candidates, used):
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            cell = bit.bit_length() - 1
+            path[depth] = cell
+            if depth == last:
+                paths.append([ divmod(c, cols) for c in path ])
+            else:
+                extend(depth + 1, index[symbols[depth + 1]] & masks[cell] & ~(used | bit),
+                       used | bit)
+            if limit is not None and len(paths) >= limit:
+                return
+
+    extend(0, index[symbols[0]], 0)
+    return paths
+
+
+def solve(faces, rows, cols, lexicon=None, min_length=MIN_WORD_LENGTH):
+    """
+    Returns a dict mapping every word that can be traced on the board to
+    one path that spells it.  faces lists the visible faces of a
+    rows x cols board in row-major order; a path is a list of (row, col)
+    tuples.  Consecutive cubes in a path must be adjacent (as in
+    BoggleBoard.is_adjacent), no cube may be used twice, and a word must
+    have at least min_length letters.  lexicon defaults to the shared
+    lexicon for bogwords.txt.
+    """
+    if lexicon is None:
+        lexicon = get_lexicon()
+    if len(faces) != rows * cols:
+        raise ValueError("expected {} faces, got {}".format(rows * cols, len(faces)))
+    faces = [ face.upper() for face in faces ]
+    symbols = face_symbols(faces)
+    children, terminal = lexicon.tables()
+
+    cells = rows * cols
+    # adjacency for this board, with each neighbour's symbol and letter
+    # count baked in: (cell, bit, symbol, letters)
+    table = neighbor_table(rows, cols)
+    adjacent = [ tuple((other, bit, symbols[other], len(faces[other]))
+                       for other, bit in table[cell])
+                 for cell in range(cells) ]
+
+    found = {}
+    path = [ 0 ] * cells
+    # stack entries: (cell, node, letters, used-cell mask, path depth)
+    stack = []
+    for cell in range(cells):
+        node = children[symbols[cell]]
+        if node:
+            stack.append((cell, node, len(faces[cell]), 1 << cell, 0))
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        cell, node, length, mask, depth = pop()
+        path[depth] = cell
+        depth += 1
+        if terminal[node] and length >= min_length:
+            word = "".join([ faces[c] for c in path[:depth] ])
+            if word not in found:
+                found[word] = [ divmod(c, cols) for c in path[:depth] ]
+        base = node * NUM_SYMBOLS
+        for other, bit, symbol, letters in adjacent[cell]:
+            if not mask & bit:
+                child = children[base + symbol]
+                if child:
+                    # only push extensions some word continues with
+                    push((other, child, length + letters, mask | bit, depth))
+    return found
+
+
+@lru_cache(maxsize=None)
+def symmetries(rows, cols):
+    """
+    Returns the symmetries of a rows x cols grid as cell permutations:
+    each is a tuple whose entry i is the cell that cell i moves to.
+    Square grids have 8 (rotations and reflections), other grids 4.
+    The identity comes first.
+    >>> len(symmetries(4, 4)), len(symmetries(3, 5))
+    (8, 4)
+    >>> symmetries(2, 2)[1]
+    (1, 3, 0, 2)
+    """
+    last_row, last_col = rows - 1, cols - 1
+    moves = [ lambda r, c: (r, c),
+              lambda r, c: (last_row - r, last_col - c),
+              lambda r, c: (r, last_col - c),
+              lambda r, c: (last_row - r, c) ]
+    if rows == cols:
+        moves[1:1] = [ lambda r, c: (c, last_row - r) ]
+        moves += [ lambda r, c: (last_col - c, r),
+                   lambda r, c: (c, r),
+                   lambda r, c: (last_col - c, last_row - r) ]
+    table = []
+    for move in moves:
+        permutation = []
+        for cell in range(rows * cols):
+            r, c = move(*divmod(cell, cols))
+            permutation.append(r * cols + c)
+        table.append(tuple(permutation))
+    return tuple(table)
+
+
+class SolutionCache:
+    """
+    An LRU cache of board solutions (see solve) that treats rotations and
+    reflections of a board as the same board.  Solutions are stored under
+    a canonical key, the smallest of the board's faces over all grid
+    symmetries, and paths are mapped back to the layout asked about.
+    >>> cache = SolutionCache(maxsize=2)
+    >>> faces = list("ATJAAAABDDEEEEEG")
+    >>> turned = [ None ] * 16
+    >>> for cell, moved in enumerate(symmetries(4, 4)[1]):
+    ...     turned[moved] = faces[cell]
+    >>> words = cache.solve(faces, 4, 4)
+    >>> rotated = cache.solve(turned, 4, 4)
+    >>> cache.get_hits(), cache.get_misses(), set(rotated) == set(words)
+    (1, 1, True)
+    >>> all("".join(turned[r * 4 + c] for r, c in path) == word
+    ...     for word, path in rotated.items())
+    True
+
+    The least recently used board is dropped once maxsize are cached:
+    >>> other = cache.solve(list("ABCDEFGHIJKLMNOP"), 4, 4)
+    >>> again = cache.solve(faces, 4, 4)
+    >>> last = cache.solve(list("SSSSEEEETTTTAAAA"), 4, 4)
+    >>> len(cache), cache.get_hits(), cache.get_misses()
+    (2, 2, 3)
+    >>> other = cache.solve(list("ABCDEFGHIJKLMNOP"), 4, 4)
+    >>> len(cache), cache.get_hits(), cache.get_misses()
+    (2, 2, 4)
+    """
+    # Attributes:
+    # _entries: OrderedDict of key -> solution in canonical orientation,
+    #           least recently used first
+    # _maxsize: the most solutions kept
+    # _lexicon: the Lexicon to solve with (None: the shared default)
+    # _hits, _misses: lookup counters
+
+    __slots__ = [ "_entries", "_maxsize", "_lexicon", "_hits", "_misses" ]
+
+    def __init__(self, maxsize=4096, lexicon=None):
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self._lexicon = lexicon
+        self._hits = 0
+        self._misses = 0
+
+    def get_hits(self):
+        return self._hits
+
+    def get_misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Empties the cache and resets the counters"""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def solve(self, faces, rows, cols, lexicon=None):
+        """
+        Returns the same result as solve(faces, rows, cols, lexicon),
+        reusing the solution of any rotation or reflection of the board
+        solved before.
+        """
+        if lexicon is None:
+            lexicon = self._lexicon if self._lexicon is not None else get_lexicon()
+        if len(faces) != rows * cols:
+            raise ValueError("expected {} faces, got {}".format(rows * cols, len(faces)))
+        faces = [ face.upper() for face in faces ]
+
+        # find the orientation with the smallest faces
+        best = None
+        for permutation in symmetries(rows, cols):
+            moved = [ None ] * len(faces)
+            for cell, face in enumerate(faces):
+                moved[permutation[cell]] = face
+            moved = tuple(moved)
+            if best is None or moved < best[0]:
+                best = (moved, permutation)
+        canonical, permutation = best
+        key = (lexicon, rows, cols, canonical)
+
+        solution = self._entries.get(key)
+        if solution is None:
+            self._misses += 1
+            solution = solve(canonical, rows, cols, lexicon)
+            self._entries[key] = solution
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._hits += 1
+            self._entries.move_to_end(key)
+
+        # map canonical positions back to this layout
+        inverse = [ 0 ] * len(permutation)
+        for cell, moved in enumerate(permutation):
+            inverse[moved] = divmod(cell, cols)
+        return { word: [ inverse[r * cols + c] for r, c in path ]
+                 for word, path in solution.items() }
+
+
+# _solution_cache: the cache used by solve_cached
+_solution_cache = SolutionCache()
+
+
+def solve_cached(faces, rows, cols, lexicon=None):
+    """
+    Like solve, but answered from a process-wide SolutionCache.
+    """
+    return _solution_cache.solve(faces, rows, cols, lexicon)
+
+
+def solution_cache():
+    """Returns the process-wide SolutionCache used by solve_cached"""
+    return _solution_cache
+
+
+class IncrementalSolver:
+    """
+    Keeps the solution of one board up to date as its faces change.
+
+    Every path the search visits (every path whose letters start some
+    word) is kept, indexed by the cell it ends on, and every path that
+    spells a word is indexed by each cell it uses.  After a local edit (a
+    new face on a cube, or two cubes swapped) only paths through the
+    changed cells are dropped and searched again: each new path is an
+    unchanged kept path extended into a changed cell, so nothing that
+    avoids the changed cells is walked twice.
+
+    Typical use with a BoggleBoard:
+        solver = IncrementalSolver(board.get_faces(), 4, 4)
+        ... shake or rearrange the board's cubes ...
+        added, removed, delta = solver.sync(board.get_faces())
+
+    After every edit the words and score match a full solve:
+    >>> solver = IncrementalSolver(list("ATJAAAABDDEEEEEG"), 4, 4)
+    >>> def matches():
+    ...     words = solve(solver.get_faces(), 4, 4)
+    ...     return solver.words() == set(words) and solver.get_score() == total_score(words)
+    >>> added, removed, delta = solver.set_face(5, "QU")
+    >>> matches(), delta == total_score(added) - total_score(removed)
+    (True, True)
+    >>> edits = [ solver.swap(0, 15), solver.set_face(10, "S"), solver.swap(3, 12) ]
+    >>> matches(), "".join(solver.get_faces())
+    (True, 'GTJEAQUABDDSEAEEA')
+    """
+    # Attributes:
+    # _faces: the visible faces of the board, in row-major order
+    # _symbols: the lexicon symbol of each face
+    # _rows, _cols: the board shape
+    # _lexicon: the Lexicon words are checked against
+    # _min_length: the fewest letters a word may have
+    # _ending: for each cell, a list of (node, letters, mask, path) for
+    #          every live path ending on it; path is a tuple of cells
+    # _paths: word -> set of paths that spell it
+    # _by_cell: for each cell, the set of (word, path) pairs using it
+    # _score: the total score of all words on the board
+
+    __slots__ = [ "_faces", "_symbols", "_rows", "_cols", "_lexicon",
+                  "_min_length", "_ending", "_paths", "_by_cell", "_score" ]
+
+    def __init__(self, faces, rows, cols, lexicon=None, min_length=MIN_WORD_LENGTH):
+        if lexicon is None:
+            lexicon = get_lexicon()
+        if len(faces) != rows * cols:
+            raise ValueError("expected {} faces, got {}".format(rows * cols, len(faces)))
+        self._faces = [ face.upper() for face in faces ]
+        self._symbols = face_symbols(self._faces)
+        self._rows = rows
+        self._cols = cols
+        self._lexicon = lexicon
+        self._min_length = min_length
+        self._ending = [ [] for cell in range(rows * cols) ]
+        self._paths = {}
+        self._by_cell = [ set() for cell in range(rows * cols) ]
+        self._score = 0
+        self.__search(self.__starts(range(rows * cols)))
+
+    def get_faces(self):
+        """Returns a copy of the board's faces, in row-major order"""
+        return list(self._faces)
+
+    def get_score(self):
+        """Returns the total score of all words on the board"""
+        return self._score
+
+    def words(self):
+        """Returns the set of words on the board"""
+        return set(self._paths)
+
+    def paths(self, word):
+        """
+        Returns a list of every path that spells word on the board,
+        each a list of (row, col) tuples.
+        """
+        return [ [ divmod(c, self._cols) for c in path ]
+                 for path in sorted(self._paths.get(word.upper(), ())) ]
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, word):
+        return word.upper() in self._paths
+
+    def __add_path(self, word, path):
+        """Records one path of word. Returns True if word is new."""
+        paths = self._paths.get(word)
+        is_new = paths is None
+        if is_new:
+            paths = self._paths[word] = set()
+            self._score += word_score(word)
+        paths.add(path)
+        for cell in path:
+            self._by_cell[cell].add((word, path))
+        return is_new
+
+    def __remove_path(self, word, path):
+        """Forgets one path of word. Returns True if word is now gone."""
+        for cell in path:
+            self._by_cell[cell].discard((word, path))
+        paths = self._paths[word]
+        paths.discard(path)
+        if not paths:
+            del self._paths[word]
+            self._score -= word_score(word)
+            return True
+        return False
+
+    def __starts(self, cells):
+        """Returns the one-cube paths starting on cells, as search entries."""
+        children = self._lexicon.tables()[0]
+        entries = []
+        for cell in cells:
+            node = children[self._symbols[cell]]
+            if node:
+                entries.append((cell, node, len(self._faces[cell]), 1 << cell, (cell,)))
+        return entries
+
+    def __search(self, stack):
+        """
+        Extends the (cell, node, letters, mask, path) entries on stack
+        depth-first, keeping every live path and recording every word.
+        Returns the set of words that were not on the board before.
+        """
+        faces = self._faces
+        symbols = self._symbols
+        min_length = self._min_length
+        children, terminal = self._lexicon.tables()
+        table = neighbor_table(self._rows, self._cols)
+        ending = self._ending
+        found = set()
+        while stack:
+            cell, node, length, mask, path = stack.pop()
+            ending[cell].append((node, length, mask, path))
+            if terminal[node] and length >= min_length:
+                word = "".join([ faces[c] for c in path ])
+                if self.__add_path(word, path):
+                    found.add(word)
+            base = node * NUM_SYMBOLS
+            for other, bit in table[cell]:
+                if not mask & bit:
+                    child = children[base + symbols[other]]
+                    if child:
+                        stack.append((other, child, length + len(faces[other]),
+                                      mask | bit, path + (other,)))
+        return found
+
+    def update(self, changes):
+        """
+        Applies changes, a dict mapping cell numbers (row * cols + col) to
+        new faces, and re-solves only the paths through those cells.
+        Returns (added words, removed words, score delta).
+        """
+        changes = { cell: face.upper() for cell, face in changes.items()
+                    if face.upper() != self._faces[cell] }
+        if not changes:
+            return set(), set(), 0
+        symbols = face_symbols(changes.values())
+        old_score = self._score
+
+        # drop every path that runs through a changed cell
+        required = 0
+        for cell in changes:
+            required |= 1 << cell
+        ending = self._ending
+        for cell in range(len(ending)):
+            ending[cell] = [ entry for entry in ending[cell] if not entry[2] & required ]
+        lost = set()
+        for cell in changes:
+            for word, path in list(self._by_cell[cell]):
+                if self.__remove_path(word, path):
+                    lost.add(word)
+
+        for (cell, face), symbol in zip(changes.items(), symbols):
+            self._faces[cell] = face
+            self._symbols[cell] = symbol
+
+        # every new path is a kept path (or nothing) followed by the
+        # first changed cell it reaches
+        children = self._lexicon.tables()[0]
+        table = neighbor_table(self._rows, self._cols)
+        stack = self.__starts(changes)
+        for cell in changes:
+            symbol = self._symbols[cell]
+            letters = len(self._faces[cell])
+            bit = 1 << cell
+            for other, other_bit in table[cell]:
+                if not other_bit & required:
+                    for node, length, mask, path in ending[other]:
+                        child = children[node * NUM_SYMBOLS + symbol]
+                        if child:
+                            stack.append((cell, child, length + letters,
+                                          mask | bit, path + (cell,)))
+        found = self.__search(stack)
+        return found - lost, lost - found, self._score - old_score
+
+    def set_face(self, cell, face):
+        """
+        Shows face on the cube at cell.  See update.
+        """
+        return self.update({ cell: face })
+
+    def swap(self, cell1, cell2):
+        """
+        Swaps the faces at cell1 and cell2.  See update.
+        """
+        return self.update({ cell1: self._faces[cell2], cell2: self._faces[cell1] })
+
+    def sync(self, faces):
+        """
+        Brings the solution up to date with faces (e.g. the result of
+        BoggleBoard.get_faces() after its cubes were edited), re-solving
+        only around the cells that differ.  See update.
+        """
+        if len(faces) != len(self._faces):
+            raise ValueError("expected {} faces, got {}".format(len(self._faces), len(faces)))
+        return self.update({ cell: face for cell, face in enumerate(faces)
+                             if face.upper() != self._faces[cell] })
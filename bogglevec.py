@@ -0,0 +1,171 @@
+"""
+NumPy-vectorized Boggle solver for batches of boards.
+
+A batch of boards is a uint8 array of shape (n, rows * cols) holding the
+lexicon symbol of each visible face in row-major order.  Instead of
+walking one board at a time, the depth-first search of bogglesolver is
+run breadth-first over the whole batch: every live path of every board
+is one row of the frontier arrays, and each level extends all of them
+at once through the lexicon's DAWG table.
+
+Words are identified by their rank in the lexicon (their position in
+alphabetical order), which is accumulated edge by edge along each path
+so that a word found along several paths is only counted once.
+
+This module requires NumPy; the rest of the game does not.
+"""
+
+import numpy as np
+
+import bogglesolver
+from lexicon import NUM_SYMBOLS, QU, get_lexicon
+
+# _LETTERS: letters contributed by each symbol ("QU" counts as two)
+_LETTERS = np.ones(NUM_SYMBOLS, dtype=np.int16)
+_LETTERS[QU] = 2
+
+# _SCORES: points for a word, indexed by its number of letters (capped)
+_SCORES = np.array([ bogglesolver.word_score("X" * n) for n in range(9) ], dtype=np.int32)
+
+# _tables: lexicon -> (children, terminal, offsets) arrays, see _arrays
+_tables = {}
+
+
+def encode_boards(boards):
+    """
+    Converts a list of boards (each a list of faces in row-major order)
+    to a uint8 array of lexicon symbols with shape (n, cells).
+    >>> encode_boards([["C", "A", "T", "QU"]]).tolist()
+    [[2, 0, 19, 16]]
+    """
+    return np.array([ bogglesolver.face_symbols(faces) for faces in boards ], dtype=np.uint8)
+
+
+def _arrays(lexicon):
+    """
+    Returns (children, terminal, offsets) arrays for lexicon.  children
+    is a (nodes, NUM_SYMBOLS) view of the lexicon's dense child table.
+    offsets[node, symbol] is the number of words that sort before the
+    words reached through that edge, so the rank of a word is the sum of
+    offsets along its path.
+    """
+    arrays = _tables.get(id(lexicon))
+    if arrays is not None and arrays[0] is lexicon:
+        return arrays[1:]
+
+    children, terminal = lexicon.tables()
+    children = np.asarray(children).reshape(-1, NUM_SYMBOLS)
+    terminal = np.asarray(terminal).astype(np.int64)
+    has_child = children != 0
+
+    # counts[node] = words in the sub-DAWG below node; relax until stable,
+    # which takes one pass per level of the deepest word
+    counts = terminal.copy()
+    while True:
+        below = np.where(has_child, counts[children], 0).sum(axis=1)
+        updated = terminal + below
+        if np.array_equal(updated, counts):
+            break
+        counts = updated
+
+    child_counts = np.where(has_child, counts[children], 0)
+    offsets = terminal[:, None] + np.cumsum(child_counts, axis=1) - child_counts
+    offsets = offsets.astype(np.int32)
+
+    _tables[id(lexicon)] = (lexicon, children, terminal.astype(bool), offsets)
+    return children, terminal.astype(bool), offsets
+
+
+def _padded_neighbors(rows, cols):
+    """
+    Returns a (cells, 8) array of neighbour cells.  Cells with fewer than
+    8 neighbours are padded with the cell itself, which every path
+    through it has already used, so padding never extends a path.
+    """
+    table = bogglesolver.neighbor_table(rows, cols)
+    padded = np.repeat(np.arange(rows * cols, dtype=np.intp)[:, None], 8, axis=1)
+    for cell, neighbors in enumerate(table):
+        for k, (other, bit) in enumerate(neighbors):
+            padded[cell, k] = other
+    return padded
+
+
+def _solve_batch(boards, rows, cols, children, terminal, offsets, words, min_length):
+    """
+    Solves one batch.  Returns (word counts, scores) arrays.
+    """
+    n, cells = boards.shape
+    neighbors = _padded_neighbors(rows, cols)
+    neighbor_bits = np.left_shift(np.uint64(1), neighbors.astype(np.uint64))
+    # symbols[board * cells + cell, k]: the face symbol of neighbour k of cell
+    symbols = boards[:, neighbors].reshape(n * cells, 8).astype(np.int32)
+    children = children.reshape(-1)
+
+    # level 0: one path per cell of every board; a path is one row of
+    # the frontier arrays below, and spot = board * cells + cell
+    spot = np.arange(n * cells, dtype=np.int32)
+    symbol = boards.reshape(-1).astype(np.int32)
+    node = children[symbol]
+    live = node != 0
+    spot, symbol, node = spot[live], symbol[live], node[live]
+    rank = offsets[0, symbol].astype(np.int64)
+    letters = _LETTERS[symbol]
+    mask = np.left_shift(np.uint64(1), (spot % cells).astype(np.uint64))
+
+    found_keys = []
+    found_letters = []
+    while spot.size:
+        hit = terminal[node] & (letters >= min_length)
+        found_keys.append((spot[hit] // cells) * words + rank[hit])
+        found_letters.append(letters[hit])
+
+        # try every (path, neighbour slot) pair at once, then keep the
+        # unused neighbours that the DAWG has an edge for
+        cell = spot % cells
+        other_bit = neighbor_bits[cell]
+        symbol = symbols[spot]
+        child = children[(node * NUM_SYMBOLS)[:, None] + symbol]
+        ok = ((mask[:, None] & other_bit) == 0) & (child != 0)
+        path, slot = np.nonzero(ok)
+
+        symbol = symbol[path, slot]
+        rank = rank[path] + offsets[node[path], symbol]
+        letters = letters[path] + _LETTERS[symbol]
+        mask = mask[path] | other_bit[path, slot]
+        node = child[path, slot]
+        spot = spot[path] - cell[path] + neighbors[cell[path], slot].astype(np.int32)
+
+    keys = np.concatenate(found_keys)
+    letters = np.concatenate(found_letters)
+    keys, first = np.unique(keys, return_index=True)
+    owner = keys // words
+    counts = np.bincount(owner, minlength=n)
+    scores = np.bincount(owner, weights=_SCORES[np.minimum(letters[first], 8)], minlength=n)
+    return counts.astype(np.int64), scores.astype(np.int64)
+
+
+def solve_boards(boards, rows=4, cols=4, lexicon=None,
+                 min_length=bogglesolver.MIN_WORD_LENGTH, batch_size=1024):
+    """
+    Solves a batch of boards given as a uint8 array of lexicon symbols
+    with shape (n, rows * cols).  Returns (word counts, scores), two
+    int64 arrays of length n that match bogglesolver.solve board by
+    board.  Boards are processed batch_size at a time to bound memory.
+    """
+    if lexicon is None:
+        lexicon = get_lexicon()
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim != 2 or boards.shape[1] != rows * cols:
+        raise ValueError("expected an array of shape (n, {})".format(rows * cols))
+    if rows * cols > 64:
+        raise ValueError("boards with more than 64 cells are not supported")
+    children, terminal, offsets = _arrays(lexicon)
+    words = max(len(lexicon), 1)
+
+    counts = np.zeros(len(boards), dtype=np.int64)
+    scores = np.zeros(len(boards), dtype=np.int64)
+    for start in range(0, len(boards), batch_size):
+        batch = boards[start:start + batch_size]
+        counts[start:start + len(batch)], scores[start:start + len(batch)] = \
+            _solve_batch(batch, rows, cols, children, terminal, offsets, words, min_length)
+    return counts, scores
@@ -0,0 +1,90 @@
+"""
+The dice (cube face sets) used to build Boggle boards.
+
+Kept separate from boggleboard so that solvers and generators can use
+the dice without importing the graphics module.
+
+The classic 4x4 set is built in (CUBE_FACES).  Other sets, such as the
+5x5 Big Boggle dice, are read from dice.json next to this module, which
+maps a set name to its "rows", "cols" and "dice" (a list of face lists,
+one per cube, with "QU" as a single face).
+"""
+
+import json
+import os
+
+from lexicon import FACE_SYMBOLS
+
+DEFAULT_DICE = "classic"
+DICE_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dice.json")
+
+# _dice_cache: (path, name) -> (rows, cols, dice) returned by get_dice
+_dice_cache = {}
+
+# CUBE_FACES stores a list of tuples that represent the unique legal faces
+# for BoggleCube objects
+CUBE_FACES = [("A", "A", "C", "I", "O", "T"),  # cube 0 
+              ("T", "Y", "A", "B", "I", "L"),  # cube 1
+              ("J", "M", "O", "QU", "A", "B"), # cube 2
+              ("A", "C", "D", "E", "M", "P"),  # cube 3
+              ("A", "C", "E", "L", "S", "R"),  # cube 4
+              ("A", "D", "E", "N", "V", "Z"),  # cube 5
+              ("A", "H", "M", "O", "R", "S"),  # cube 6
+              ("B", "F", "I", "O", "R", "X"),  # cube 7
+              ("D", "E", "N", "O", "S", "W"),  # cube 8
+              ("D", "K", "N", "O", "T", "U"),  # cube 9
+              ("E", "E", "F", "H", "I", "Y"),  # cube 10
+              ("E", "G", "I", "N", "T", "V"),  # cube 11
+              ("E", "G", "K", "L", "U", "Y"),  # cube 12
+              ("E", "H", "I", "N", "P", "S"),  # cube 13
+              ("E", "L", "P", "S", "T", "U"),  # cube 14
+              ("G", "I", "L", "R", "U", "W")]  # cube 15
+
+
+def load_dice_sets(path=DICE_CONFIG):
+    """
+    Returns a dict mapping each dice set name to (rows, cols, dice),
+    where dice is a tuple of face tuples, one per cube.  The classic set
+    is always included.  Raises ValueError for a malformed set.
+    """
+    sets = { DEFAULT_DICE: (4, 4, tuple(CUBE_FACES)) }
+    with open(path) as f:
+        config = json.load(f)
+    for name, entry in config.items():
+        try:
+            rows, cols = int(entry["rows"]), int(entry["cols"])
+            dice = tuple(tuple(face.upper() for face in faces) for faces in entry["dice"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError("bad dice set {!r} in {}: {}".format(name, path, e))
+        if len(dice) != rows * cols:
+            raise ValueError("dice set {!r} has {} dice for a {}x{} board".format(
+                name, len(dice), rows, cols))
+        for faces in dice:
+            for face in faces:
+                if face not in FACE_SYMBOLS:
+                    raise ValueError("dice set {!r} has unknown face {!r}".format(name, face))
+        sets[name] = (rows, cols, dice)
+    return sets
+
+
+def get_dice(name=DEFAULT_DICE, path=DICE_CONFIG):
+    """
+    Returns (rows, cols, dice) for the named dice set.  The same dice
+    tuple is returned every time, so boards of one set can share it.
+    >>> rows, cols, dice = get_dice("big")
+    >>> rows, cols, len(dice)
+    (5, 5, 25)
+    >>> get_dice("big")[2] is dice
+    True
+    """
+    key = (path, name)
+    if key not in _dice_cache:
+        if name == DEFAULT_DICE:
+            _dice_cache[key] = (4, 4, tuple(CUBE_FACES))
+        else:
+            sets = load_dice_sets(path)
+            if name not in sets:
+                raise ValueError("unknown dice set {!r}; choose from {}".format(
+                    name, ", ".join(sorted(sets))))
+            _dice_cache[key] = sets[name]
+    return _dice_cache[key]
@@ -64,6 +64,18 @@ http://mcsp.wartburg.edu/zelle/python for a quick reference"""
 
 __version__ = "5.0"
 
+# Local changes for the Boggle game
+#     * the hidden Tk root is created by the first GraphWin (or Entry,
+#       Image or update() call) instead of at import, so importing this
+#       module is cheap and needs no display
+#     * GraphWin.batch() queues item reconfigs and applies them together,
+#       with a single update, when the batch ends
+#     * getMouse and getKey block on a Tk variable that clicks, keys and
+#       closing the window set, instead of polling every 0.1 seconds; a
+#       Tcl timer still wakes them every 0.1 seconds so Ctrl-C works
+#     * _reconfig skips options set to the value they already have, and
+#       getTkStats() counts the Tk calls made and avoided
+
 # Version 5 8/26/2016
 #     * update at bottom to fix MacOS issue causing askopenfile() to hang
 #     * update takes an optional parameter specifying update rate
@@ -163,6 +175,7 @@ __version__ = "5.0"
 #     Added Entry boxes.
 
 import time, os, sys
+from contextlib import contextmanager
 
 try:  # import as appropriate for 2.x vs. 3.x
    import tkinter as tk
@@ -184,8 +197,41 @@ BAD_OPTION = "Illegal option value"
 ##########################################################################
 # global variables and funtions
 
-_root = tk.Tk()
-_root.withdraw()
+# _root: the hidden Tk root window shared by all GraphWins; created by
+# _get_root on first use, so importing this module needs no display
+_root = None
+
+def _get_root():
+    """Returns the shared Tk root window, creating it if necessary."""
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+        # MacOS fix 1, formerly run at import
+        _root.update()
+    return _root
+
+# counts of item reconfigs requested on drawn objects, of those skipped
+# because nothing changed, and of the itemconfig and update calls
+# actually made; see getTkStats
+_tkStats = {"reconfigs": 0, "unchanged": 0, "itemconfigs": 0, "updates": 0}
+
+def getTkStats():
+    """Returns a dict of Tk call counts since the last resetTkStats():
+    reconfigs requested on drawn objects, how many of those were skipped
+    as unchanged, and the itemconfig and update calls made.  Reconfigs
+    not matched by an itemconfig were avoided, either as unchanged or by
+    being merged in a GraphWin.batch()."""
+    return dict(_tkStats)
+
+def resetTkStats():
+    for key in _tkStats:
+        _tkStats[key] = 0
+
+def _flush():
+    """Updates the display (the autoflush after a change)"""
+    _tkStats["updates"] += 1
+    _root.update()
 
 _update_lasttime = time.time()
 
@@ -200,7 +246,7 @@ def update(rate=None):
         else:
             _update_lasttime = now
 
-    _root.update()
+    _get_root().update()
 
 ############################################################################
 # Graphics classes start here
@@ -212,7 +258,7 @@ class GraphWin(tk.Canvas):
     def __init__(self, title="Graphics Window",
                  width=200, height=200, autoflush=True):
         assert type(title) == type(""), "Title must be a string"
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_get_root())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height,
                            highlightthickness=0, bd=0)
@@ -228,12 +274,18 @@ class GraphWin(tk.Canvas):
         self.height = int(height)
         self.width = int(width)
         self.autoflush = autoflush
+        # bumped by every click and key press and by close(), to wake up
+        # getMouse and getKey
+        self._inputEvents = tk.IntVar(_root, 0)
+        # batch() nesting depth, and item id -> config awaiting itemconfig
+        self._batchDepth = 0
+        self._pending = {}
         self._mouseCallback = None
         self.trans = None
         self.closed = False
         master.lift()
         self.lastKey = ""
-        if autoflush: _root.update()
+        if autoflush: _flush()
 
     def __repr__(self):
         if self.isClosed():
@@ -252,6 +304,21 @@ class GraphWin(tk.Canvas):
 
     def _onKey(self, evnt):
         self.lastKey = evnt.keysym
+        self.__signalInput()
+
+    def __signalInput(self):
+        """Wakes up getMouse and getKey"""
+        self._inputEvents.set(self._inputEvents.get() + 1)
+
+    def __waitForInput(self):
+        """Runs the event loop until the next click, key press or close,
+        or for at most 0.1 seconds so that Ctrl-C is not held up"""
+        # a Tcl-only timer: a Python callback could swallow KeyboardInterrupt
+        timer = self.tk.call("after", 100, "incr", str(self._inputEvents))
+        try:
+            self.wait_variable(self._inputEvents)
+        finally:
+            self.tk.call("after", "cancel", timer)
 
 
     def setBackground(self, color):
@@ -271,6 +338,7 @@ class GraphWin(tk.Canvas):
 
         if self.closed: return
         self.closed = True
+        self.__signalInput()
         self.master.destroy()
         self.__autoflush()
 
@@ -284,8 +352,43 @@ class GraphWin(tk.Canvas):
 
 
     def __autoflush(self):
+        if self._autoflushing():
+            _flush()
+
+    def _autoflushing(self):
+        """True if changes should be shown right away: autoflush is on
+        and no batch is open"""
+        return self.autoflush and not self._batchDepth
+
+    @contextmanager
+    def batch(self):
+        """Context manager that groups drawing changes: item reconfigs
+        are queued and applied, with one update, when the outermost
+        batch ends.  Eg:
+
+        with win.batch():
+            for cell in cells:
+                cell.setFill("white")
+        """
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if not self._batchDepth:
+                self._flushBatch()
+
+    def _flushBatch(self):
+        """Applies the reconfigs queued by batch()"""
+        pending = self._pending
+        self._pending = {}
+        if self.closed:
+            return
+        for item, options in pending.items():
+            self.itemconfig(item, options)
+        _tkStats["itemconfigs"] += len(pending)
         if self.autoflush:
-            _root.update()
+            _flush()
 
 
     def plot(self, x, y, color="black"):
@@ -314,9 +417,8 @@ class GraphWin(tk.Canvas):
         self.mouseX = None
         self.mouseY = None
         while self.mouseX == None or self.mouseY == None:
-            self.update()
             if self.isClosed(): raise GraphicsError("getMouse in closed window")
-            time.sleep(.1) # give up thread
+            self.__waitForInput()
         x,y = self.toWorld(self.mouseX, self.mouseY)
         self.mouseX = None
         self.mouseY = None
@@ -340,9 +442,8 @@ class GraphWin(tk.Canvas):
         """Wait for user to press a key and return it as a string."""
         self.lastKey = ""
         while self.lastKey == "":
-            self.update()
             if self.isClosed(): raise GraphicsError("getKey in closed window")
-            time.sleep(.1) # give up thread
+            self.__waitForInput()
 
         key = self.lastKey
         self.lastKey = ""
@@ -387,6 +488,7 @@ class GraphWin(tk.Canvas):
         self.mouseY = e.y
         if self._mouseCallback:
             self._mouseCallback(Point(e.x, e.y))
+        self.__signalInput()
 
     def addItem(self, item):
         self.items.append(item)
@@ -485,8 +587,8 @@ class GraphicsObject:
         self.canvas = graphwin
         self.id = self._draw(graphwin, self.config)
         graphwin.addItem(self)
-        if graphwin.autoflush:
-            _root.update()
+        if graphwin._autoflushing():
+            _flush()
         return self
 
 
@@ -499,8 +601,9 @@ class GraphicsObject:
         if not self.canvas.isClosed():
             self.canvas.delete(self.id)
             self.canvas.delItem(self)
-            if self.canvas.autoflush:
-                _root.update()
+            self.canvas._pending.pop(self.id, None)
+            if self.canvas._autoflushing():
+                _flush()
         self.canvas = None
         self.id = None
 
@@ -521,8 +624,8 @@ class GraphicsObject:
                 x = dx
                 y = dy
             self.canvas.move(self.id, x, y)
-            if canvas.autoflush:
-                _root.update()
+            if canvas._autoflushing():
+                _flush()
 
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -531,11 +634,25 @@ class GraphicsObject:
         if option not in self.config:
             raise GraphicsError(UNSUPPORTED_METHOD)
         options = self.config
+        drawn = self.canvas and not self.canvas.isClosed()
+        if drawn:
+            _tkStats["reconfigs"] += 1
+        if options[option] == setting:
+            # nothing changed, so there is nothing to send to Tk
+            if drawn:
+                _tkStats["unchanged"] += 1
+            return
         options[option] = setting
-        if self.canvas and not self.canvas.isClosed():
-            self.canvas.itemconfig(self.id, options)
-            if self.canvas.autoflush:
-                _root.update()
+        if drawn:
+            if self.canvas._batchDepth:
+                # options is updated in place, so the flush applies the
+                # latest value of every option
+                self.canvas._pending[self.id] = options
+            else:
+                self.canvas.itemconfig(self.id, options)
+                _tkStats["itemconfigs"] += 1
+                if self.canvas.autoflush:
+                    _flush()
 
 
     def _draw(self, canvas, options):
@@ -859,7 +976,7 @@ class Entry(GraphicsObject):
         self.anchor = p.clone()
         #print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_get_root())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -896,7 +1013,7 @@ class Entry(GraphicsObject):
     def clone(self):
         other = Entry(self.anchor, self.width)
         other.config = self.config.copy()
-        other.text = tk.StringVar()
+        other.text = tk.StringVar(_get_root())
         other.text.set(self.text.get())
         other.fill = self.fill
         return other
@@ -954,10 +1071,10 @@ class Image(GraphicsObject):
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
         if len(pixmap) == 1: # file name provided
-            self.img = tk.PhotoImage(file=pixmap[0], master=_root)
+            self.img = tk.PhotoImage(file=pixmap[0], master=_get_root())
         else: # width and height provided
             width, height = pixmap
-            self.img = tk.PhotoImage(master=_root, width=width, height=height)
+            self.img = tk.PhotoImage(master=_get_root(), width=width, height=height)
 
     def __repr__(self):
         return "Image({}, {}, {})".format(self.anchor, self.getWidth(), self.getHeight())
@@ -1080,8 +1197,7 @@ def test():
 #MacOS fix 2
 #tk.Toplevel(_root).destroy()
 
-# MacOS fix 1
-update()
+# MacOS fix 1 (the update() that was here) now runs in _get_root
 
 if __name__ == "__main__":
     test()
@@ -0,0 +1,508 @@
+"""
+Compiled lexicon support for Boggle.
+
+The plain-text word list (bogwords.txt) is compiled once into a minimized
+DAWG stored as a compact binary file.  The compiled file is memory-mapped
+when loaded, so membership queries run directly off the (shared, read-only)
+file pages instead of a freshly built set of strings.
+
+The DAWG is indexed over the cube-face alphabet rather than plain letters:
+the two-letter face "QU" is a single symbol, so a board can be traversed
+as a walk over integer symbols.  Words with a "Q" that is not followed by
+"U" cannot appear on a board and are left out.
+
+Compiled file layout (all integers little-endian):
+    header:    magic, format version, alphabet size, node count, word
+               count, edge count
+    masks:     one uint32 per node; bit s is set if the node has an edge
+               for symbol s, and bit 31 if a word ends at the node
+    first:     one index per node: the position in edges of its first edge
+    edges:     the child node of every edge, grouped by parent node and in
+               symbol order within a node
+    Indexes in first and edges are uint16 if every node number and edge
+    position fits in 16 bits, else uint32.  Node 0 is the root, which is
+    never the target of an edge.  The child reached from node by symbol s
+    is edges[first[node] + (number of mask bits of node below bit s)].
+
+Solvers that need O(1) child lookups get a dense node x symbol table,
+built in memory on first use by Lexicon.tables().
+
+Build step:
+    python lexicon.py [bogwords.txt [bogwords.lex]]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+# FACES: the cube faces the lexicon is indexed over, in symbol order
+FACES = ("A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M",
+         "N", "O", "P", "QU", "R", "S", "T", "U", "V", "W", "X", "Y", "Z")
+NUM_SYMBOLS = len(FACES)
+QU = FACES.index("QU")
+
+# FACE_SYMBOLS: maps each face string to its symbol
+FACE_SYMBOLS = { face: sym for sym, face in enumerate(FACES) }
+
+MAGIC = b"BOGLEX\0\0"
+FORMAT_VERSION = 3
+DEFAULT_LEXICON = "bogwords.txt"
+COMPILED_SUFFIX = ".lex"
+
+_HEADER = struct.Struct("<8sIIIII")
+_TERMINAL = 1 << 31
+
+# _registry: absolute path -> (mtime_ns, size, Lexicon) for get_lexicon
+_registry = {}
+_registry_lock = threading.Lock()
+
+# _load_locks: absolute path -> lock held while that file is loaded, so
+# a file is loaded once without blocking lookups of other files
+_load_locks = {}
+
+# _loader: worker thread used by get_lexicon_async, created on first use
+_loader = None
+_loader_lock = threading.Lock()
+
+
+class Lexicon:
+    """
+    An immutable set of words backed by a compiled DAWG table.
+    Lexicons are created with Lexicon.load (memory-mapped compiled file)
+    or Lexicon.from_words (compiled in memory).
+    """
+    # Attributes:
+    # _buffer: the object (bytes or mmap) holding the compiled lexicon
+    # _masks: memoryview (uint32) of per-node edge masks and terminal bits
+    # _first: memoryview of the index of each node's first edge
+    # _edges: memoryview of the child node of every edge
+    # _tables: the dense (children, terminal) tables, built by tables()
+    # _nodes: number of nodes in the DAWG
+    # _words: number of words in the lexicon
+
+    __slots__ = [ "_buffer", "_masks", "_first", "_edges", "_tables", "_nodes", "_words" ]
+
+    def __init__(self, buffer):
+        """
+        Wraps a compiled lexicon held in buffer (bytes or mmap).
+        Raises ValueError if buffer is not a compiled lexicon.
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("not a compiled lexicon: file too short")
+        magic, version, symbols, nodes, words, edges = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a compiled lexicon: bad magic number")
+        if version != FORMAT_VERSION or symbols != NUM_SYMBOLS:
+            raise ValueError("unsupported compiled lexicon version {}".format(version))
+
+        typecode = _index_type(nodes, edges)
+        width = array(typecode).itemsize
+        masks_start = _HEADER.size
+        first_start = masks_start + 4 * nodes
+        edges_start = first_start + width * nodes
+        edges_end = edges_start + width * edges
+        if len(buffer) < edges_end:
+            raise ValueError("compiled lexicon is truncated")
+
+        view = memoryview(buffer)
+        self._buffer = buffer
+        self._masks = _int_view(view[masks_start:first_start], "I")
+        self._first = _int_view(view[first_start:edges_start], typecode)
+        self._edges = _int_view(view[edges_start:edges_end], typecode)
+        self._tables = None
+        self._nodes = nodes
+        self._words = words
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-maps the compiled lexicon stored at path.
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @classmethod
+    def from_words(cls, words):
+        """
+        Compiles an iterable of words into an in-memory Lexicon.
+        """
+        return cls(compile_words(words))
+
+    def tables(self):
+        """
+        Returns the (children, terminal) tables for solvers that walk the
+        DAWG directly: children[node * NUM_SYMBOLS + symbol] is the child
+        node (0 if none) and terminal[node] is 1 if a word ends at node.
+        The root is node 0.  The tables are built on the first call and
+        take about 4 * NUM_SYMBOLS bytes per node.
+        >>> children, terminal = Lexicon.from_words(["at"]).tables()
+        >>> node = children[FACE_SYMBOLS["A"]]
+        >>> terminal[children[node * NUM_SYMBOLS + FACE_SYMBOLS["T"]]], terminal[node]
+        (1, 0)
+        """
+        if self._tables is None:
+            masks, first, edges = self._masks, self._first, self._edges
+            children = array("i", bytes(4 * self._nodes * NUM_SYMBOLS))
+            terminal = bytearray(self._nodes)
+            for node in range(self._nodes):
+                mask = masks[node]
+                terminal[node] = mask >> 31
+                base = node * NUM_SYMBOLS
+                edge = first[node]
+                for sym in range(NUM_SYMBOLS):
+                    if mask >> sym & 1:
+                        children[base + sym] = edges[edge]
+                        edge += 1
+            self._tables = (memoryview(children), memoryview(terminal))
+        return self._tables
+
+    def child(self, node, symbol):
+        """
+        Returns the node reached from node by symbol, or 0 if none.
+        """
+        mask = self._masks[node]
+        if not mask >> symbol & 1:
+            return 0
+        below = mask & ((1 << symbol) - 1)
+        return self._edges[self._first[node] + bin(below).count("1")]
+
+    def is_terminal(self, node):
+        """
+        Returns True if a word ends at node.
+        """
+        return self._masks[node] & _TERMINAL != 0
+
+    def _walk(self, text, partial=False):
+        """
+        Follows text from the root and returns the node reached,
+        or -1 if text leaves the DAWG.
+        """
+        symbols = tokenize(text, partial)
+        if symbols is None:
+            return -1
+        node = 0
+        for sym in symbols:
+            node = self.child(node, sym)
+            if node == 0:
+                return -1
+        return node
+
+    def contains(self, word):
+        """
+        Returns True if word is in the lexicon (case-insensitive).
+        >>> Lexicon.from_words(["cat", "cats"]).contains("Cat")
+        True
+        >>> Lexicon.from_words(["cat", "cats"]).contains("ca")
+        False
+        """
+        node = self._walk(word)
+        return node > 0 and self.is_terminal(node)
+
+    def is_prefix(self, prefix):
+        """
+        Returns True if at least one word in the lexicon starts with
+        prefix (case-insensitive).  A trailing "Q" is read as "QU".
+        Runs in O(len(prefix)).
+        >>> lexicon = Lexicon.from_words(["cat", "cats", "quit"])
+        >>> lexicon.is_prefix("CA"), lexicon.is_prefix("cats"), lexicon.is_prefix("cb")
+        (True, True, False)
+        >>> lexicon.is_prefix("q"), lexicon.is_prefix("qui")
+        (True, True)
+        """
+        return self._walk(prefix, partial=True) >= 0 and self._words > 0
+
+    def completions(self, prefix, limit=10):
+        """
+        Returns a list of at most limit words starting with prefix, in
+        alphabetical order (all of them if limit is None).  Finding the
+        prefix is O(len(prefix)); each completion costs its own length.
+        >>> Lexicon.from_words(["cat", "cats", "catch", "dog"]).completions("ca")
+        ['CAT', 'CATCH', 'CATS']
+        >>> Lexicon.from_words(["cat", "cats", "catch", "dog"]).completions("", 2)
+        ['CAT', 'CATCH']
+        """
+        node = self._walk(prefix, partial=True)
+        if node < 0:
+            return []
+        prefix = prefix.upper()
+        if prefix.endswith("Q"):
+            prefix += "U"
+        masks, first, edges = self._masks, self._first, self._edges
+        result = []
+        # depth-first, pushing children in reverse so they pop in order
+        stack = [ (node, prefix) ]
+        while stack and (limit is None or len(result) < limit):
+            node, text = stack.pop()
+            mask = masks[node]
+            if mask & _TERMINAL:
+                result.append(text)
+            edge = first[node] + bin(mask & ~_TERMINAL).count("1")
+            for sym in range(NUM_SYMBOLS - 1, -1, -1):
+                if mask >> sym & 1:
+                    edge -= 1
+                    stack.append((edges[edge], text + FACES[sym]))
+        return result
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def __len__(self):
+        return self._words
+
+    def __repr__(self):
+        return "Lexicon({} words, {} nodes)".format(self._words, self._nodes)
+
+
+def _index_type(nodes, edges):
+    """
+    Returns the array typecode of the node and edge indexes of a compiled
+    lexicon: "H" (uint16) if they all fit in 16 bits, else "I" (uint32).
+    """
+    return "H" if max(nodes, edges) <= 0xFFFF else "I"
+
+
+def _int_view(view, typecode):
+    """
+    Returns a memoryview of little-endian integers as native integers,
+    copying (and byte-swapping) only on big-endian machines.
+    """
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    values = array(typecode, view)
+    values.byteswap()
+    return memoryview(values)
+
+
+def tokenize(text, partial=False):
+    """
+    Converts text to a list of face symbols, reading "QU" as one symbol.
+    Returns None if text cannot be spelled with cube faces.  If partial
+    is True, a trailing "Q" is accepted as the start of "QU".
+    >>> tokenize("quit")
+    [16, 8, 19]
+    >>> tokenize("qat") is None
+    True
+    """
+    symbols = []
+    text = text.upper()
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "Q":
+            if i + 1 < n and text[i + 1] == "U":
+                i += 1
+            elif not (partial and i + 1 == n):
+                return None
+            symbols.append(QU)
+        else:
+            sym = FACE_SYMBOLS.get(ch)
+            if sym is None or sym == QU:
+                return None
+            symbols.append(sym)
+        i += 1
+    return symbols
+
+
+def _normalize(words):
+    """
+    Upper-cases and strips words, dropping blanks and anything that
+    cannot be spelled with cube faces.  Returns a sorted list of unique
+    words as (word, symbols) pairs.
+    """
+    result = {}
+    for word in words:
+        word = word.strip().upper()
+        symbols = tokenize(word)
+        if word and symbols is not None:
+            result[word] = symbols
+    return sorted(result.items())
+
+
+def compile_words(words):
+    """
+    Builds a minimized DAWG from an iterable of words and returns
+    the compiled lexicon as bytes.
+    """
+    words = _normalize(words)
+    symbols = NUM_SYMBOLS
+
+    # build a plain trie: one dict of {symbol: child} per node
+    edges = [ {} ]
+    terminal = [ False ]
+    for word, word_symbols in words:
+        node = 0
+        for sym in word_symbols:
+            child = edges[node].get(sym)
+            if child is None:
+                child = len(edges)
+                edges[node][sym] = child
+                edges.append({})
+                terminal.append(False)
+            node = child
+        terminal[node] = True
+
+    # minimize bottom-up: nodes with equal signatures are merged
+    register = {}
+    canonical = [0] * len(edges)
+    # children always have a larger index than their parent
+    for node in range(len(edges) - 1, -1, -1):
+        signature = (terminal[node],
+                     tuple((sym, canonical[child]) for sym, child in sorted(edges[node].items())))
+        canonical[node] = register.setdefault(signature, node)
+
+    # renumber the surviving nodes breadth-first from the root
+    number = { 0: 0 }
+    order = [ 0 ]
+    for node in order:
+        for sym, child in sorted(edges[node].items()):
+            child = canonical[child]
+            if child not in number:
+                number[child] = len(order)
+                order.append(child)
+
+    nodes = len(order)
+    masks = array("I")
+    first = []
+    children = []
+    for node in order:
+        mask = _TERMINAL if terminal[node] else 0
+        first.append(len(children))
+        for sym, child in sorted(edges[node].items()):
+            mask |= 1 << sym
+            children.append(number[canonical[child]])
+        masks.append(mask)
+    typecode = _index_type(nodes, len(children))
+    first = array(typecode, first)
+    children = array(typecode, children)
+    if sys.byteorder != "little":
+        for values in (masks, first, children):
+            values.byteswap()
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, symbols, nodes, len(words), len(children))
+    return header + masks.tobytes() + first.tobytes() + children.tobytes()
+
+
+def compiled_path(text_path):
+    """
+    Returns the path of the compiled lexicon that corresponds
+    to the word list at text_path.
+    """
+    return os.path.splitext(text_path)[0] + COMPILED_SUFFIX
+
+
+def compile_lexicon(text_path=DEFAULT_LEXICON, lex_path=None):
+    """
+    Compiles the word list at text_path (one word per line) and writes
+    it to lex_path.  Returns the path of the compiled file.
+    """
+    if lex_path is None:
+        lex_path = compiled_path(text_path)
+    with open(text_path) as f:
+        data = compile_words(f)
+    # write to a temporary file first so readers never see a partial file
+    tmp_path = "{}.{}.tmp".format(lex_path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, lex_path)
+    return lex_path
+
+
+def load_lexicon(path=DEFAULT_LEXICON):
+    """
+    Returns a Lexicon for path.  A compiled (.lex) path is memory-mapped
+    directly.  For a word list, the compiled file next to it is used,
+    and (re)built first if it is missing or older than the word list.
+    If the compiled file cannot be written, the lexicon is compiled
+    in memory instead.
+    """
+    if path.endswith(COMPILED_SUFFIX):
+        return Lexicon.load(path)
+
+    lex_path = compiled_path(path)
+    try:
+        stale = os.path.getmtime(lex_path) < os.path.getmtime(path)
+    except OSError:
+        stale = True
+    if stale:
+        try:
+            compile_lexicon(path, lex_path)
+        except OSError:
+            with open(path) as f:
+                return Lexicon.from_words(f)
+    try:
+        return Lexicon.load(lex_path)
+    except ValueError:
+        # compiled by an older version of this module
+        compile_lexicon(path, lex_path)
+        return Lexicon.load(lex_path)
+
+
+def _registered(key, st):
+    """
+    Returns the registered Lexicon for key if it is current for the
+    os.stat() result st, else None.  Call with _registry_lock held.
+    """
+    entry = _registry.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    return None
+
+
+def get_lexicon(path=DEFAULT_LEXICON):
+    """
+    Returns the process-wide shared Lexicon for path, loading it on first
+    use.  Every caller gets the same immutable object; the lexicon is
+    reloaded only when the file's modification time or size changes.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    with _registry_lock:
+        lexicon = _registered(key, st)
+        if lexicon is not None:
+            return lexicon
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+    # load outside _registry_lock, so other files and other callers of
+    # get_lexicon_async are not held up by a slow load or compile
+    with load_lock:
+        with _registry_lock:
+            lexicon = _registered(key, st)
+        if lexicon is None:
+            lexicon = load_lexicon(key)
+            with _registry_lock:
+                _registry[key] = (st.st_mtime_ns, st.st_size, lexicon)
+        return lexicon
+
+
+def get_lexicon_async(path=DEFAULT_LEXICON):
+    """
+    Starts get_lexicon(path) on a background worker thread and returns a
+    concurrent.futures.Future whose result() is the shared Lexicon.
+    """
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lexicon")
+    return _loader.submit(get_lexicon, path)
+
+
+def clear_lexicon_cache():
+    """
+    Forgets all lexicons loaded by get_lexicon.
+    """
+    with _registry_lock:
+        _registry.clear()
+
+
+if __name__ == "__main__":
+    text_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LEXICON
+    lex_path = sys.argv[2] if len(sys.argv) > 2 else None
+    lex_path = compile_lexicon(text_path, lex_path)
+    lexicon = Lexicon.load(lex_path)
+    print("compiled {} -> {}: {} words, {} nodes, {} bytes".format(
+        text_path, lex_path, len(lexicon), lexicon._nodes, os.path.getsize(lex_path)))
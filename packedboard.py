@@ -0,0 +1,204 @@
+"""
+Compact board state, independent of BoggleCube objects.
+
+A PackedBoard stores a layout as a single bytes object: one byte per
+cell giving which die sits there (its index in the dice set), followed
+by one byte per cell giving which face of that die is showing.  The dice
+set itself is shared by every board.  BoggleCube objects are only made,
+on request, when something like the graphical board needs them.
+
+BoardStore packs many layouts of one dice set back to back in a single
+bytearray, for workloads that keep millions of boards in memory.
+"""
+
+import random
+
+from dice import DEFAULT_DICE, get_dice
+
+
+class PackedBoard:
+    """
+    An immutable rows x cols layout of dice, packed into bytes.
+    >>> board = PackedBoard.shaken(rng=random.Random(1))
+    >>> len(board.to_bytes()), len(board.get_faces())
+    (32, 16)
+    >>> cubes = board.make_cubes()
+    >>> [ cube.get_letter() for cube in cubes ] == board.get_faces()
+    True
+    >>> PackedBoard.from_cubes(board.get_dice(), 4, 4, cubes) == board
+    True
+    """
+    # Attributes:
+    # _dice: the shared tuple of face tuples, one per die
+    # _rows, _cols: the board shape
+    # _state: bytes; _state[cell] is the die at cell and
+    #         _state[cells + cell] is the index of its visible face
+
+    __slots__ = [ "_dice", "_rows", "_cols", "_state" ]
+
+    def __init__(self, dice, rows, cols, state):
+        cells = rows * cols
+        if len(dice) != cells or len(state) != 2 * cells:
+            raise ValueError("a {}x{} board needs {} dice and {} bytes of state".format(
+                rows, cols, cells, 2 * cells))
+        if cells > 256:
+            raise ValueError("boards with more than 256 cells cannot be packed")
+        self._dice = dice
+        self._rows = rows
+        self._cols = cols
+        self._state = bytes(state)
+
+    @classmethod
+    def from_layout(cls, dice, rows, cols, cubes, faces):
+        """
+        Packs a layout given as a list of die numbers and a list of
+        face indices, both in row-major order.
+        """
+        return cls(dice, rows, cols, bytes(cubes) + bytes(faces))
+
+    @classmethod
+    def from_cubes(cls, dice, rows, cols, cubes):
+        """
+        Packs a list of BoggleCubes (in row-major order) whose faces come
+        from dice, e.g. the cubes of a BoggleBoard.
+        """
+        unused = {}
+        for number, faces in enumerate(dice):
+            unused.setdefault(faces, []).append(number)
+        numbers = []
+        for cube in cubes:
+            numbers.append(unused[cube.get_faces()].pop(0))
+        return cls.from_layout(dice, rows, cols, numbers,
+                               [ cube.get_face_idx() for cube in cubes ])
+
+    @classmethod
+    def shaken(cls, dice_set=DEFAULT_DICE, rng=random):
+        """
+        Returns a random layout of the named dice set, as
+        BoggleBoard.shake_cubes would make it.
+        """
+        rows, cols, dice = get_dice(dice_set)
+        cubes = list(range(len(dice)))
+        rng.shuffle(cubes)
+        faces = [ rng.randrange(len(dice[cube])) for cube in cubes ]
+        return cls.from_layout(dice, rows, cols, cubes, faces)
+
+    def get_rows(self):
+        return self._rows
+
+    def get_cols(self):
+        return self._cols
+
+    def get_dice(self):
+        return self._dice
+
+    def to_bytes(self):
+        """Returns the packed state: die numbers, then face indices"""
+        return self._state
+
+    def get_cube_number(self, row, col):
+        """Returns the number of the die at (row, col)"""
+        return self._state[row * self._cols + col]
+
+    def get_letter(self, row, col):
+        """Returns the visible face of the die at (row, col)"""
+        cell = row * self._cols + col
+        return self._dice[self._state[cell]][self._state[len(self._dice) + cell]]
+
+    def get_faces(self):
+        """Returns the visible faces of all dice, in row-major order"""
+        cells = len(self._dice)
+        state = self._state
+        dice = self._dice
+        return [ dice[state[cell]][state[cells + cell]] for cell in range(cells) ]
+
+    def make_cubes(self):
+        """
+        Returns a new list of BoggleCubes for this layout, in row-major
+        order, e.g. for BoggleBoard.load_packed.
+        """
+        from bogglecube import BoggleCube
+        cells = len(self._dice)
+        return [ BoggleCube(self._dice[self._state[cell]], self._state[cells + cell])
+                 for cell in range(cells) ]
+
+    def __eq__(self, other):
+        return isinstance(other, PackedBoard) and self._dice == other._dice and \
+            self._rows == other._rows and self._state == other._state
+
+    def __hash__(self):
+        return hash(self._state)
+
+    def __str__(self):
+        faces = self.get_faces()
+        cols = self._cols
+        return "\n".join(" ".join("{:2}".format(face) for face in faces[row * cols:row * cols + cols])
+                         for row in range(self._rows))
+
+    def __repr__(self):
+        return "PackedBoard({!r})".format("".join(self.get_faces()))
+
+
+class BoardStore:
+    """
+    A growable list of layouts of one dice set, stored back to back in
+    a bytearray (2 bytes per cell per board).
+    >>> rng = random.Random(2)
+    >>> boards = [ PackedBoard.shaken(rng=rng) for i in range(3) ]
+    >>> store = BoardStore()
+    >>> store.append(boards[0])
+    >>> store.extend(boards[1].to_bytes() + boards[2].to_bytes())
+    >>> len(store), store.nbytes()
+    (3, 96)
+    >>> store[0] == boards[0], store[2] == boards[2], store[-1] == boards[2], store[-3] == boards[0]
+    (True, True, True, True)
+    >>> store[3]
+    Traceback (most recent call last):
+    ...
+    IndexError: board index out of range
+    >>> store.extend(b"xyz")
+    Traceback (most recent call last):
+    ...
+    ValueError: data is not a whole number of packed boards
+    """
+    # Attributes:
+    # _dice: the shared tuple of face tuples, one per die
+    # _rows, _cols: the board shape
+    # _data: bytearray of packed states
+
+    __slots__ = [ "_dice", "_rows", "_cols", "_data" ]
+
+    def __init__(self, dice_set=DEFAULT_DICE):
+        self._rows, self._cols, self._dice = get_dice(dice_set)
+        self._data = bytearray()
+
+    def append(self, board):
+        """Adds a PackedBoard of this store's dice set"""
+        if board.get_rows() != self._rows or board.get_cols() != self._cols or \
+           board.get_dice() != self._dice:
+            raise ValueError("board does not use this store's dice")
+        self._data += board.to_bytes()
+
+    def extend(self, data):
+        """
+        Adds boards given as packed states back to back in one
+        bytes-like object, e.g. from bogglegen.to_store
+        """
+        if len(data) % (2 * len(self._dice)):
+            raise ValueError("data is not a whole number of packed boards")
+        self._data += data
+
+    def __len__(self):
+        return len(self._data) // (2 * len(self._dice))
+
+    def __getitem__(self, i):
+        size = 2 * len(self._dice)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("board index out of range")
+        return PackedBoard(self._dice, self._rows, self._cols, self._data[i * size:(i + 1) * size])
+
+    def nbytes(self):
+        """Returns the bytes used by the packed states"""
+        return len(self._data)